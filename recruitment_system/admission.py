@@ -0,0 +1,246 @@
+import asyncio
+import inspect
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager, asynccontextmanager
+from functools import wraps
+from flask import jsonify
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted within the queue limits"""
+
+    def __init__(self, pool, reason, retry_after):
+        super().__init__(f"{pool} overloaded: {reason}")
+        self.pool = pool
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionPool:
+    """Concurrency limit with a bounded, time-limited wait queue"""
+
+    def __init__(self, name, concurrency, queue, timeout):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+        self.timeout = timeout
+        self.condition = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.completed = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_service = 0.0
+
+    def retry_after(self):
+        """Seconds until a slot is likely free, from the average service time"""
+        average = self.total_service / self.completed if self.completed else 1.0
+        return max(1, math.ceil(average * (self.waiting + 1) / self.concurrency))
+
+    def acquire(self):
+        start = time.monotonic()
+        with self.condition:
+            if self.active < self.concurrency:
+                self.active += 1
+                self.admitted += 1
+                return
+
+            if self.waiting >= self.queue:
+                self.rejected_queue_full += 1
+                raise Overloaded(self.name, "queue full", self.retry_after())
+
+            self.waiting += 1
+            try:
+                deadline = start + self.timeout
+                while self.active >= self.concurrency:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected_timeout += 1
+                        raise Overloaded(self.name, "queue timeout", self.retry_after())
+                    self.condition.wait(remaining)
+
+                self.active += 1
+                self.admitted += 1
+                waited = time.monotonic() - start
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+            finally:
+                self.waiting -= 1
+
+    def release(self, service_time):
+        with self.condition:
+            self.active -= 1
+            self.completed += 1
+            self.total_service += service_time
+            self.condition.notify()
+
+    def metrics(self):
+        with self.condition:
+            return {
+                "concurrency": self.concurrency,
+                "queue_limit": self.queue,
+                "active": self.active,
+                "waiting": self.waiting,
+                "admitted": self.admitted,
+                "completed": self.completed,
+                "rejected_queue_full": self.rejected_queue_full,
+                "rejected_timeout": self.rejected_timeout,
+                "avg_wait_seconds": self.total_wait / self.admitted if self.admitted else 0.0,
+                "max_wait_seconds": self.max_wait,
+                "avg_service_seconds": self.total_service / self.completed if self.completed else 0.0
+            }
+
+
+class AsyncAdmissionPool(AdmissionPool):
+    """AdmissionPool for coroutine views: waiting suspends the task, not a thread
+
+    All acquirers must run on one event loop.
+    """
+
+    def __init__(self, name, concurrency, queue, timeout):
+        super().__init__(name, concurrency, queue, timeout)
+        self.async_condition = None
+
+    async def acquire(self):
+        if self.async_condition is None:
+            self.async_condition = asyncio.Condition()
+
+        start = time.monotonic()
+        async with self.async_condition:
+            if self.active < self.concurrency:
+                self.active += 1
+                self.admitted += 1
+                return
+
+            if self.waiting >= self.queue:
+                self.rejected_queue_full += 1
+                raise Overloaded(self.name, "queue full", self.retry_after())
+
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(
+                    self.async_condition.wait_for(lambda: self.active < self.concurrency),
+                    self.timeout
+                )
+            except asyncio.TimeoutError:
+                self.rejected_timeout += 1
+                raise Overloaded(self.name, "queue timeout", self.retry_after())
+            finally:
+                self.waiting -= 1
+
+            self.active += 1
+            self.admitted += 1
+            waited = time.monotonic() - start
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    async def release(self, service_time):
+        async with self.async_condition:
+            self.active -= 1
+            self.completed += 1
+            self.total_service += service_time
+            self.async_condition.notify_all()
+
+
+class AdmissionController:
+    """Per endpoint class admission control for expensive routes
+
+    limits maps a class name to {"concurrency", "queue", "timeout"}. Requests
+    over the limit are shed with 503 and a Retry-After header instead of
+    piling up behind the running ones.
+    """
+
+    def __init__(self, limits, pool_class=AdmissionPool, respond=jsonify):
+        self.respond = respond
+        self.pools = {
+            name: pool_class(name, **config)
+            for name, config in limits.items()
+        }
+
+    def overloaded_response(self, error):
+        logger.warning(f"Rejected request: {str(error)}")
+        return self.respond({"error": "Server busy, please retry later"}), 503, {
+            "Retry-After": str(error.retry_after)
+        }
+
+    @contextmanager
+    def admitted(self, pool_name):
+        """Hold a slot in the named pool around part of a request
+
+        Raises Overloaded if no slot frees up in time.
+        """
+        pool = self.pools[pool_name]
+        pool.acquire()
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            pool.release(time.monotonic() - start)
+
+    @asynccontextmanager
+    async def admitted_async(self, pool_name):
+        """admitted() for an AsyncAdmissionPool, from a coroutine on its loop"""
+        pool = self.pools[pool_name]
+        await pool.acquire()
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            await pool.release(time.monotonic() - start)
+
+    @contextmanager
+    def admitted_threadsafe(self, pool_name, loop):
+        """admitted() for an AsyncAdmissionPool, from a thread outside its loop"""
+        pool = self.pools[pool_name]
+        asyncio.run_coroutine_threadsafe(pool.acquire(), loop).result()
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            asyncio.run_coroutine_threadsafe(pool.release(time.monotonic() - start), loop).result()
+
+    def limit(self, pool_name):
+        """Route decorator admitting the request through the named pool"""
+        def decorator(view):
+            if inspect.iscoroutinefunction(view):
+                @wraps(view)
+                async def async_wrapper(*args, **kwargs):
+                    pool = self.pools[pool_name]
+                    try:
+                        await pool.acquire()
+                    except Overloaded as e:
+                        return self.overloaded_response(e)
+
+                    start = time.monotonic()
+                    try:
+                        return await view(*args, **kwargs)
+                    finally:
+                        await pool.release(time.monotonic() - start)
+                return async_wrapper
+
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                pool = self.pools[pool_name]
+                try:
+                    pool.acquire()
+                except Overloaded as e:
+                    return self.overloaded_response(e)
+
+                start = time.monotonic()
+                try:
+                    return view(*args, **kwargs)
+                finally:
+                    pool.release(time.monotonic() - start)
+            return wrapper
+        return decorator
+
+    def metrics(self):
+        return {name: pool.metrics() for name, pool in self.pools.items()}
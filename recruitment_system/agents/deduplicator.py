@@ -0,0 +1,70 @@
+import hashlib
+import logging
+import zlib
+import numpy as np
+
+class Deduplicator:
+    """MinHash signatures and LSH band keys for near-duplicate resume detection"""
+
+    MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+    MAX_HASH = np.uint64((1 << 32) - 1)
+
+    def __init__(self, num_perm=128, bands=16, threshold=0.8, shingle_size=3, seed=1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        self.logger = logging.getLogger(__name__)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        # Fixed seed so signatures stay comparable across restarts
+        generator = np.random.RandomState(seed)
+        self.a = generator.randint(1, (1 << 32) - 1, size=num_perm, dtype=np.uint64)
+        self.b = generator.randint(0, (1 << 32) - 1, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text):
+        """Word n-gram shingles of processed resume text"""
+        tokens = (text or '').split()
+        if len(tokens) < self.shingle_size:
+            return {' '.join(tokens)} if tokens else set()
+        return {
+            ' '.join(tokens[i:i + self.shingle_size])
+            for i in range(len(tokens) - self.shingle_size + 1)
+        }
+
+    def signature(self, text):
+        """MinHash signature of a text, or None when there is nothing to hash"""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+
+        hashes = np.array(
+            [zlib.crc32(shingle.encode('utf-8')) for shingle in shingles],
+            dtype=np.uint64
+        )
+        # One universal hash per permutation, min over all shingles
+        with np.errstate(over='ignore'):
+            permuted = (np.outer(hashes, self.a) + self.b) % self.MERSENNE_PRIME
+        permuted &= self.MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def band_keys(self, signature):
+        """One signed 64-bit bucket key per LSH band"""
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(chunk, digest_size=8).digest()
+            keys.append(int.from_bytes(digest, 'big', signed=True))
+        return keys
+
+    def similarity(self, first, second):
+        """Estimated Jaccard similarity of two signatures"""
+        return float(np.mean(first == second))
+
+    def to_bytes(self, signature):
+        return None if signature is None else signature.astype(np.uint32).tobytes()
+
+    def from_bytes(self, blob):
+        return None if not blob else np.frombuffer(blob, dtype=np.uint32)
@@ -0,0 +1,58 @@
+import random
+import threading
+import time
+
+
+class FakeGmailError(Exception):
+    """Simulated Gmail API failure"""
+
+
+class FakeGmailService:
+    """Local stand-in for the Gmail API client used by Scheduler
+
+    Mirrors the service.users().messages().send(userId=..., body=...).execute()
+    call chain, sleeping for a configurable latency and failing a configurable
+    fraction of sends, so scheduling can be load tested without Google.
+    """
+
+    def __init__(self, latency=0.2, jitter=0.05, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def send(self, userId, body):
+        return _FakeRequest(self, body)
+
+    def _execute(self, body):
+        with self.lock:
+            delay = max(0.0, self.random.gauss(self.latency, self.jitter))
+            fail = self.random.random() < self.error_rate
+        time.sleep(delay)
+
+        with self.lock:
+            if fail:
+                self.failed += 1
+            else:
+                self.sent += 1
+        if fail:
+            raise FakeGmailError("Simulated Gmail send failure")
+        return {"id": f"fake-{self.sent}", "labelIds": ["SENT"]}
+
+
+class _FakeRequest:
+    def __init__(self, service, body):
+        self.service = service
+        self.body = body
+
+    def execute(self):
+        return self.service._execute(self.body)
@@ -5,13 +5,24 @@ import logging
 import os
 
 class Matcher:
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, fallback=True):
+        """Load the fine-tuned model and its tokenizer from model_path
+
+        Both are read from local files only. With fallback=False a model that
+        fails to load raises instead of being replaced by the base
+        distilbert-base-uncased model, whose classifier head is untrained.
+        """
         self.logger = logging.getLogger(__name__)
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         self.logger.info(f"Using device: {self.device}")
         
         # Initialize tokenizer
-        self.tokenizer = DistilBertTokenizer.from_pretrained('distilbert-base-uncased')
+        if model_path and os.path.exists(os.path.join(model_path, 'vocab.txt')):
+            self.tokenizer = DistilBertTokenizer.from_pretrained(model_path, local_files_only=True)
+        elif fallback:
+            self.tokenizer = DistilBertTokenizer.from_pretrained('distilbert-base-uncased')
+        else:
+            raise FileNotFoundError(f"Tokenizer not found in {model_path}")
         
         # Load model
         try:
@@ -23,15 +34,19 @@ class Matcher:
                     local_files_only=True,
                     trust_remote_code=True
                 )
-            else:
+            elif fallback:
                 self.logger.warning(f"Model path not found: {model_path}. Using default model.")
                 self.model = DistilBertForSequenceClassification.from_pretrained('distilbert-base-uncased')
+            else:
+                raise FileNotFoundError(f"Model path not found: {model_path}")
             
             self.model.to(self.device)
             self.model.eval()
             self.logger.info("Model loaded successfully")
         except Exception as e:
             self.logger.error(f"Error loading model: {str(e)}")
+            if not fallback:
+                raise
             self.logger.info("Using default model as fallback")
             self.model = DistilBertForSequenceClassification.from_pretrained('distilbert-base-uncased')
             self.model.to(self.device)
@@ -91,8 +106,12 @@ class Matcher:
             self.logger.error(f"Error computing match score: {str(e)}")
             return 0.0
 
-    def get_match_details(self, jd_summary, parsed_resume):
-        """Get detailed matching information"""
+    def get_match_details(self, jd_summary, parsed_resume, match_score=None):
+        """Get detailed matching information
+
+        When a stored match_score is passed the model is not re-run, so only the
+        skills and education of the resume are needed.
+        """
         try:
             # Parse JSON strings if needed
             if isinstance(jd_summary, str):
@@ -101,7 +120,8 @@ class Matcher:
                 parsed_resume = json.loads(parsed_resume)
 
             # Get match score
-            match_score = self.compute_match(jd_summary, parsed_resume)
+            if match_score is None:
+                match_score = self.compute_match(jd_summary, parsed_resume)
 
             # Compare skills
             jd_skills = set(jd_summary.get('skills', []))
@@ -9,11 +9,12 @@ from googleapiclient.discovery import build
 import pickle
 
 class Scheduler:
-    def __init__(self):
+    def __init__(self, service=None):
+        """service: a ready Gmail API client; skips OAuth when given (e.g. a local fake)"""
         self.logger = logging.getLogger(__name__)
         self.SCOPES = ['https://www.googleapis.com/auth/gmail.send']
         self.creds = None
-        self.service = None
+        self.service = service
 
     def authenticate(self):
         """Authenticate with Google OAuth"""
@@ -0,0 +1,114 @@
+import json
+import logging
+import os
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from agents.matcher import Matcher
+
+# Score clipping before the logit transform, so p = 0 or 1 stays finite
+SCORE_EPSILON = 1e-4
+
+
+def _identity(features):
+    return features
+
+
+def make_vectorizer(n_features):
+    """Hashes the feature strings of a JD/resume pair into a sparse row"""
+    return HashingVectorizer(
+        analyzer=_identity,
+        n_features=n_features,
+        alternate_sign=False,
+        norm='l2'
+    )
+
+
+def pair_features(jd_summary, parsed_resume, max_words):
+    """Feature strings for a JD/resume pair
+
+    Covers JD and resume words, words the two share, shared and missing
+    skills and coarse overlap statistics. Like the teacher, which reads at
+    most 512 tokens of JD + resume, only the first max_words words of the
+    pair are used.
+    """
+    jd_words = jd_summary.get('processed_text', '').split()[:max_words]
+    resume_words = parsed_resume.get('processed_text', '').split()[:max(max_words - len(jd_words), 0)]
+    jd_set, resume_set = set(jd_words), set(resume_words)
+    shared = jd_set & resume_set
+
+    jd_skills = set(jd_summary.get('skills', []))
+    resume_skills = set(parsed_resume.get('skills', []))
+
+    coverage = len(shared) / len(jd_set) if jd_set else 0.0
+    features = ["bias"]
+    features += [f"j:{word}" for word in jd_set]
+    features += [f"r:{word}" for word in resume_words]
+    features += [f"x:{word}" for word in shared]
+    features += [f"s:{skill}" for skill in jd_skills & resume_skills]
+    features += [f"m:{skill}" for skill in jd_skills - resume_skills]
+    features.append(f"coverage:{int(coverage * 10)}")
+    features.append(f"skills:{len(jd_skills & resume_skills)}/{len(jd_skills)}")
+    features.append(f"length:{int(np.log2(len(resume_words) + 1))}")
+    return features
+
+
+def score_to_logit(scores):
+    scores = np.clip(np.asarray(scores, dtype=np.float64), SCORE_EPSILON, 1 - SCORE_EPSILON)
+    return np.log(scores / (1 - scores))
+
+
+class StudentMatcher(Matcher):
+    """Matcher backend using a linear model distilled from the DistilBERT matcher
+
+    The model predicts the teacher's logit from hashed pair features, so a
+    score costs one sparse dot product instead of a transformer pass.
+    Train it with distill_matcher.py.
+    """
+
+    MODEL_FILE = 'student.npz'
+    META_FILE = 'student.json'
+
+    def __init__(self, model_path):
+        self.logger = logging.getLogger(__name__)
+        if not os.path.exists(os.path.join(model_path, self.MODEL_FILE)):
+            raise FileNotFoundError(
+                f"Student model not found in {model_path}; train it with distill_matcher.py"
+            )
+
+        with open(os.path.join(model_path, self.META_FILE)) as f:
+            self.meta = json.load(f)
+        weights = np.load(os.path.join(model_path, self.MODEL_FILE))
+        self.coef = weights['coef']
+        self.intercept = float(weights['intercept'])
+        self.max_words = self.meta['max_words']
+        self.vectorizer = make_vectorizer(self.meta['n_features'])
+        self.logger.info(f"Loaded student matcher from: {model_path}")
+
+    @staticmethod
+    def save(model_path, coef, intercept, meta):
+        os.makedirs(model_path, exist_ok=True)
+        np.savez(os.path.join(model_path, StudentMatcher.MODEL_FILE), coef=coef, intercept=intercept)
+        with open(os.path.join(model_path, StudentMatcher.META_FILE), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    def transform(self, pairs):
+        """Sparse feature matrix for a list of (jd_summary, parsed_resume) dicts"""
+        return self.vectorizer.transform(
+            pair_features(jd_summary, parsed_resume, self.max_words)
+            for jd_summary, parsed_resume in pairs
+        )
+
+    def compute_match(self, jd_summary, parsed_resume):
+        """Compute match score between JD and resume"""
+        try:
+            if isinstance(jd_summary, str):
+                jd_summary = json.loads(jd_summary)
+            if isinstance(parsed_resume, str):
+                parsed_resume = json.loads(parsed_resume)
+
+            logit = self.transform([(jd_summary, parsed_resume)]).dot(self.coef)[0] + self.intercept
+            return float(1 / (1 + np.exp(-logit)))
+
+        except Exception as e:
+            self.logger.error(f"Error computing match score: {str(e)}")
+            return 0.0
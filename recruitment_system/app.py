@@ -1,13 +1,28 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import os
+import json
 import logging
 from datetime import datetime
-from models import db, Job, Candidate, Application, Interview
+from functools import partial
+from config import Config
+from models import db, Job, Application, Interview
 from agents.jd_summarizer import JDSummarizer
 from agents.resume_parser import ResumeParserAgent
 from agents.matcher import Matcher
+from agents.student_matcher import StudentMatcher
 from agents.scheduler import Scheduler
+from agents.deduplicator import Deduplicator
+from services import StaleSummary, add_application, apply_job_update, known_match_score, candidate_page, application_match_details
+from sqlalchemy.exc import OperationalError
+from schema import upgrade_schema
+from dedupe import find_duplicate
+from database import engine_options, configure_engine, GroupCommitter
+from search_index import ensure_search_index, search_candidates, parse_cursor
+from admission import AdmissionController, Overloaded
+from http_cache import ResponseCache, conditional_job_view
+from rescoring import Rescorer
+from exports import ranked_candidate_chunks, ndjson_stream, csv_stream, parquet_stream, pa
 
 # Configure logging
 logging.basicConfig(
@@ -21,15 +36,27 @@ app = Flask(__name__)
 CORS(app)
 
 # Configure app
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///recruitment.db"
-app.config["UPLOAD_FOLDER"] = "static/uploads"
-app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16MB max file size
+app.config.from_object(Config)
 
 # Ensure upload directory exists
 os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
 
-# Initialize database
+# Initialize database: pooled connections, and WAL with a busy timeout on SQLite
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config, app.config["SQLALCHEMY_DATABASE_URI"])
 db.init_app(app)
+with app.app_context():
+    configure_engine(db.engine, app.config["SQLITE_BUSY_TIMEOUT_MS"])
+    group_committer = GroupCommitter(
+        db.engine,
+        max_batch=app.config["GROUP_COMMIT_MAX_BATCH"],
+        max_delay=app.config["GROUP_COMMIT_MAX_DELAY"]
+    ) if app.config["GROUP_COMMIT"] else None
+
+# Initialize admission control
+admission = AdmissionController(app.config["ADMISSION_LIMITS"])
+
+# Initialize response cache for job read endpoints
+response_cache = ResponseCache(app.config["RESPONSE_CACHE_MAX_BYTES"])
 
 # Initialize agents
 jd_summarizer = JDSummarizer()
@@ -38,12 +65,36 @@ resume_parser = ResumeParserAgent()
 # Get the absolute path to the model directory
 current_dir = os.path.dirname(os.path.abspath(__file__))
 model_path = os.path.join(os.path.dirname(current_dir), 'distilbert_resume_matcher')
-logger.info(f"Loading model from: {model_path}")
+student_model_path = app.config["STUDENT_MODEL_PATH"] or os.path.join(os.path.dirname(current_dir), 'student_matcher')
+
+if app.config["MATCHER_BACKEND"] == "student":
+    logger.info(f"Loading student matcher from: {student_model_path}")
+    matcher = StudentMatcher(student_model_path)
+else:
+    logger.info(f"Loading model from: {model_path}")
+    matcher = Matcher(model_path)
+if app.config["FAKE_GMAIL"]:
+    from agents.fake_gmail import FakeGmailService
+    logger.info("Using fake Gmail service")
+    scheduler = Scheduler(service=FakeGmailService(
+        latency=app.config["FAKE_GMAIL_LATENCY"],
+        error_rate=app.config["FAKE_GMAIL_ERROR_RATE"]
+    ))
+else:
+    scheduler = Scheduler()
+deduplicator = Deduplicator()
 
-matcher = Matcher(model_path)
-scheduler = Scheduler()
+# Background re-scoring of applications after a job's summary changes
+with app.app_context():
+    rescorer = Rescorer(
+        db.engine,
+        matcher,
+        batch_size=app.config["RESCORE_BATCH_SIZE"],
+        admit=partial(admission.admitted, "inference")
+    )
 
 @app.route("/api/jobs", methods=["POST"])
+@admission.limit("upload")
 def create_job():
     """Create a new job posting"""
     try:
@@ -72,7 +123,51 @@ def create_job():
         logger.error(f"Error creating job: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
 
+@app.route("/api/jobs/<int:job_id>", methods=["PUT"])
+@admission.limit("upload")
+def update_job(job_id):
+    """Edit a job posting
+
+    A new description is summarized again; if the summary changed, the
+    job's applications are re-scored in the background.
+    """
+    try:
+        data = request.json
+        if not data or not ("title" in data or "description" in data):
+            return jsonify({"error": "Missing required fields"}), 400
+
+        job = db.session.get(Job, job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
+        # Generate JD summary for the new description
+        summary = jd_summarizer.summarize(data["description"]) if "description" in data else None
+
+        rescoring = apply_job_update(job, data.get("title"), data.get("description"), summary)
+        db.session.commit()
+        if rescoring:
+            rescorer.submit(job_id)
+
+        return jsonify({
+            "job_id": job_id,
+            "rescoring": rescoring,
+            "message": "Job updated successfully"
+        })
+
+    except Exception as e:
+        logger.error(f"Error updating job: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@app.route("/api/jobs/<int:job_id>/rescoring", methods=["GET"])
+def rescoring_status(job_id):
+    """Progress of the job's latest background re-score"""
+    status = rescorer.status(job_id)
+    if status is None:
+        return jsonify({"state": "idle"})
+    return jsonify(status)
+
 @app.route("/api/apply", methods=["POST"])
+@admission.limit("upload")
 def apply_to_job():
     """Process a job application"""
     try:
@@ -83,6 +178,12 @@ def apply_to_job():
         if resume_file.filename == "":
             return jsonify({"error": "No selected file"}), 400
 
+        # Get job details
+        job = db.session.get(Job, int(request.form["job_id"]))
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        job_id, jd_summary = job.job_id, job.summary
+
         # Save resume
         resume_path = os.path.join(app.config["UPLOAD_FOLDER"], resume_file.filename)
         resume_file.save(resume_path)
@@ -90,73 +191,184 @@ def apply_to_job():
         # Parse resume
         parsed_data = resume_parser.parse(resume_path)
 
-        # Create candidate record
-        candidate = Candidate(
-            name=request.form["name"],
-            email=request.form["email"],
-            resume_path=resume_path,
-            parsed_data=parsed_data
-        )
-        db.session.add(candidate)
-        db.session.commit()
-
-        # Get job details
-        job = Job.query.get(request.form["job_id"])
-        if not job:
-            return jsonify({"error": "Job not found"}), 404
+        # Link to an earlier near-identical resume if any, reusing its score for this job
+        signature = deduplicator.signature(json.loads(parsed_data).get("processed_text", ""))
+        duplicate_of = find_duplicate(db.session, deduplicator, signature)
+        while True:
+            match_score = known_match_score(db.session, duplicate_of, job_id, jd_summary)
+            # End the read transaction before inference
+            db.session.rollback()
+            if match_score is None:
+                with admission.admitted("inference"):
+                    match_score = matcher.compute_match(jd_summary, parsed_data)
 
-        # Compute match score
-        match_score = matcher.compute_match(job.summary, parsed_data)
-
-        # Create application record
-        application = Application(
-            job_id=job.job_id,
-            candidate_id=candidate.candidate_id,
-            match_score=match_score
-        )
-        db.session.add(application)
-        db.session.commit()
+            # Create candidate and application records in a single transaction
+            write = partial(
+                add_application,
+                deduplicator=deduplicator,
+                job_id=job_id,
+                name=request.form["name"],
+                email=request.form["email"],
+                resume_path=resume_path,
+                parsed_data=parsed_data,
+                signature=signature,
+                duplicate_of=duplicate_of,
+                match_score=match_score,
+                jd_summary=jd_summary
+            )
+            try:
+                if group_committer is not None:
+                    application = group_committer.run(write)
+                else:
+                    application = write(db.session)
+                    db.session.commit()
+                break
+            except StaleSummary:
+                # The job was edited while scoring; score against its new summary
+                db.session.rollback()
+                jd_summary = db.session.query(Job.summary).filter_by(job_id=job_id).scalar()
 
         return jsonify({
             "application_id": application.application_id,
             "match_score": match_score,
+            "duplicate_of": duplicate_of,
             "message": "Application submitted successfully"
         }), 201
 
+    except Overloaded as e:
+        return admission.overloaded_response(e)
     except Exception as e:
         logger.error(f"Error processing application: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route("/api/jobs/<int:job_id>/candidates", methods=["GET"])
+@conditional_job_view(response_cache)
 def get_candidates(job_id):
-    """Get all candidates for a job"""
+    """Get candidates for a job, best match first
+
+    Optional query parameters: page and per_page paginate (the total is sent
+    in X-Total-Count), min_score and status filter, and details=0 leaves out
+    match_details.
+    """
     try:
-        applications = Application.query.filter_by(job_id=job_id).all()
-        candidates = []
-        
-        for app in applications:
-            candidate = app.candidate
-            match_details = matcher.get_match_details(
-                app.job.summary,
-                candidate.parsed_data
-            )
-            
-            candidates.append({
-                "candidate_id": candidate.candidate_id,
-                "name": candidate.name,
-                "email": candidate.email,
-                "match_score": app.match_score,
-                "status": app.status,
-                "match_details": match_details
-            })
-        
-        return jsonify(candidates)
+        candidates, headers = candidate_page(db.session, matcher, job_id, request.args)
+        return jsonify(candidates), 200, headers
 
     except Exception as e:
         logger.error(f"Error fetching candidates: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
 
+@app.route("/api/applications/<int:application_id>/match", methods=["GET"])
+def get_match_details(application_id):
+    """Get match details for a single application"""
+    try:
+        match_details = application_match_details(db.session, matcher, application_id)
+        if match_details is None:
+            return jsonify({"error": "Application not found"}), 404
+        return jsonify(match_details)
+
+    except Exception as e:
+        logger.error(f"Error fetching match details: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@app.route("/api/jobs/<int:job_id>/candidates/stream", methods=["GET"])
+@conditional_job_view()
+def stream_candidates(job_id):
+    """Stream a job's ranked candidates as NDJSON, one candidate per line"""
+    try:
+        job = Job.query.get(job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
+        # Chunks are read in their own sessions; release this one before streaming
+        db.session.close()
+        chunks = ranked_candidate_chunks(db.engine, matcher, job)
+        return Response(
+            stream_with_context(ndjson_stream(chunks)),
+            mimetype="application/x-ndjson"
+        )
+
+    except Exception as e:
+        logger.error(f"Error streaming candidates: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@app.route("/api/jobs/<int:job_id>/candidates/export", methods=["GET"])
+@conditional_job_view()
+def export_candidates(job_id):
+    """Export a job's ranked candidates as CSV or Parquet for ATS handoff"""
+    try:
+        export_format = request.args.get("format", "csv").lower()
+        if export_format not in ("csv", "parquet"):
+            return jsonify({"error": "Unsupported export format"}), 400
+        if export_format == "parquet" and pa is None:
+            return jsonify({"error": "Parquet export requires pyarrow"}), 501
+
+        job = Job.query.get(job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
+        # Chunks are read in their own sessions; release this one before streaming
+        db.session.close()
+        chunks = ranked_candidate_chunks(db.engine, matcher, job)
+        if export_format == "csv":
+            body, mimetype = csv_stream(chunks), "text/csv"
+        else:
+            body, mimetype = parquet_stream(chunks), "application/vnd.apache.parquet"
+
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={
+                "Content-Disposition": f"attachment; filename=job_{job_id}_candidates.{export_format}"
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Error exporting candidates: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@app.route("/api/candidates/search", methods=["GET"])
+def search():
+    """Full-text search over the candidate pool"""
+    try:
+        query = request.args.get("q", "").strip()
+        if not query:
+            return jsonify({"error": "Missing search query"}), 400
+
+        job_id = request.args.get("job_id", type=int)
+        min_score = request.args.get("min_score", type=float)
+        page = max(request.args.get("page", 1, type=int), 1)
+        per_page = min(max(request.args.get("per_page", 20, type=int), 1), 100)
+        cursor = request.args.get("cursor")
+        if cursor is not None:
+            try:
+                parse_cursor(cursor)
+            except ValueError:
+                return jsonify({"error": "Invalid cursor"}), 400
+
+        try:
+            results = search_candidates(
+                db.session,
+                query,
+                job_id=job_id,
+                min_score=min_score,
+                page=page,
+                per_page=per_page,
+                cursor=cursor
+            )
+        except OperationalError as e:
+            # FTS5 reports malformed MATCH expressions as operational errors
+            logger.warning(f"Invalid search query {query!r}: {str(e)}")
+            return jsonify({"error": "Invalid search query"}), 400
+
+        return jsonify(results)
+
+    except Exception as e:
+        logger.error(f"Error searching candidates: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
 @app.route("/api/schedule", methods=["POST"])
+@admission.limit("scheduling")
 def schedule_interview():
     """Schedule an interview"""
     try:
@@ -193,6 +405,7 @@ def schedule_interview():
 
             return jsonify({
                 "interview_id": interview.interview_id,
+                "job_id": application.job_id,
                 "interview_time": result["interview_time"],
                 "message": "Interview scheduled successfully"
             }), 201
@@ -203,7 +416,19 @@ def schedule_interview():
         logger.error(f"Error scheduling interview: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
 
+@app.route("/api/metrics/admission", methods=["GET"])
+def admission_metrics():
+    """Queue depth, admissions and rejections per endpoint class"""
+    return jsonify(admission.metrics())
+
+@app.route("/api/metrics/cache", methods=["GET"])
+def cache_metrics():
+    """Response cache size and hit rate"""
+    return jsonify(response_cache.stats())
+
 if __name__ == "__main__":
     with app.app_context():
         db.create_all()
+        upgrade_schema(db.engine)
+        ensure_search_index(db.engine)
     app.run(debug=True, host="0.0.0.0", port=5000) 
\ No newline at end of file
@@ -0,0 +1,561 @@
+"""Async (ASGI) server exposing the same routes as app.py.
+
+Request I/O and DB access are async. Resume parsing and JD summarization
+run in a process pool, model inference in a small thread pool and Gmail
+sends in an I/O thread pool, so many slow clients can stay connected while
+CPU-bound work is bounded by the executor sizes in config.Config.
+
+Run with:
+    hypercorn asgi_app:app --bind 0.0.0.0:5000
+
+There is no "python asgi_app.py" entry point: parser processes are spawned,
+and a spawned process re-imports the script it was started from, which
+would load the matcher and engines again in every parser process.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from functools import partial, wraps
+from quart import Quart, Response, request, jsonify, make_response
+from quart_cors import cors
+from sqlalchemy import create_engine, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.orm import joinedload
+from config import Config
+from models import db, Job, Application, Interview
+from agents.matcher import Matcher
+from agents.student_matcher import StudentMatcher
+from agents.scheduler import Scheduler
+from agents.deduplicator import Deduplicator
+from services import StaleSummary, add_application, apply_job_update, known_match_score, candidate_page_rows, candidate_entries, application_match_inputs
+from schema import upgrade_schema
+from dedupe import find_duplicate
+from database import engine_options, configure_engine, async_database_url, GroupCommitter
+from search_index import ensure_search_index, search_candidates, parse_cursor
+from admission import AdmissionController, AsyncAdmissionPool, Overloaded
+from http_cache import ResponseCache, job_version_query, precondition_response, cache_response, tag_response
+from rescoring import Rescorer
+from exports import ranked_candidates_chunk, encode_ranked_chunk, NdjsonEncoder, CsvEncoder, ParquetEncoder, CHUNK_SIZE, pa
+import parse_worker
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Initialize Quart app
+app = Quart(__name__)
+app = cors(app)
+
+# Configure app
+app.config.from_object(Config)
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+
+# Same database Flask-SQLAlchemy opens for app.py, through an async driver
+os.makedirs(app.instance_path, exist_ok=True)
+database_url = app.config["ASYNC_DATABASE_URL"] or async_database_url(
+    app.config["SQLALCHEMY_DATABASE_URI"], app.instance_path
+)
+engine_kwargs = engine_options(app.config, database_url)
+if make_url(database_url).get_backend_name() == "sqlite":
+    # aiosqlite may default to NullPool, which takes no pool sizing
+    engine_kwargs["poolclass"] = AsyncAdaptedQueuePool
+engine = create_async_engine(database_url, **engine_kwargs)
+configure_engine(engine.sync_engine, app.config["SQLITE_BUSY_TIMEOUT_MS"])
+Session = async_sessionmaker(engine, expire_on_commit=False)
+group_committer = None
+rescorer = None
+
+# Initialize admission control and response cache
+admission = AdmissionController(app.config["ADMISSION_LIMITS"], pool_class=AsyncAdmissionPool, respond=jsonify)
+response_cache = ResponseCache(app.config["RESPONSE_CACHE_MAX_BYTES"])
+
+# Initialize agents; parsing agents live in the parser processes
+model_path = os.path.join(os.path.dirname(current_dir), 'distilbert_resume_matcher')
+student_model_path = app.config["STUDENT_MODEL_PATH"] or os.path.join(os.path.dirname(current_dir), 'student_matcher')
+
+if app.config["MATCHER_BACKEND"] == "student":
+    logger.info(f"Loading student matcher from: {student_model_path}")
+    matcher = StudentMatcher(student_model_path)
+else:
+    logger.info(f"Loading model from: {model_path}")
+    matcher = Matcher(model_path)
+if app.config["FAKE_GMAIL"]:
+    from agents.fake_gmail import FakeGmailService
+    logger.info("Using fake Gmail service")
+    scheduler = Scheduler(service=FakeGmailService(
+        latency=app.config["FAKE_GMAIL_LATENCY"],
+        error_rate=app.config["FAKE_GMAIL_ERROR_RATE"]
+    ))
+else:
+    scheduler = Scheduler()
+deduplicator = Deduplicator()
+
+executors = {}
+
+
+async def run_in(executor_name, func, *args):
+    """Await func(*args) on one of the dedicated executors"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executors[executor_name], partial(func, *args))
+
+
+@app.before_serving
+async def startup():
+    global group_committer, rescorer
+
+    # Schema setup, group commits and re-scoring use a sync engine on the same database
+    url = make_url(database_url)
+    sync_engine = create_engine(url.set(drivername=url.get_backend_name()))
+    configure_engine(sync_engine, app.config["SQLITE_BUSY_TIMEOUT_MS"])
+    db.metadata.create_all(sync_engine)
+    upgrade_schema(sync_engine)
+    ensure_search_index(sync_engine)
+    if app.config["GROUP_COMMIT"]:
+        group_committer = GroupCommitter(
+            sync_engine,
+            max_batch=app.config["GROUP_COMMIT_MAX_BATCH"],
+            max_delay=app.config["GROUP_COMMIT_MAX_DELAY"]
+        )
+    # Re-scoring runs on its own thread and takes inference slots through the loop
+    rescorer = Rescorer(
+        sync_engine,
+        matcher,
+        batch_size=app.config["RESCORE_BATCH_SIZE"],
+        admit=partial(admission.admitted_threadsafe, "inference", asyncio.get_running_loop())
+    )
+
+    # Spawned (not forked) so parser processes do not inherit the loaded model;
+    # under hypercorn they import only parse_worker, not this module
+    executors["parse"] = ProcessPoolExecutor(
+        max_workers=app.config["PARSE_WORKERS"],
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=parse_worker.init_worker
+    )
+    executors["inference"] = ThreadPoolExecutor(
+        max_workers=app.config["INFERENCE_WORKERS"], thread_name_prefix="inference"
+    )
+    executors["email"] = ThreadPoolExecutor(
+        max_workers=app.config["EMAIL_WORKERS"], thread_name_prefix="email"
+    )
+
+
+@app.after_serving
+async def shutdown():
+    for executor in executors.values():
+        executor.shutdown(wait=False, cancel_futures=True)
+    if group_committer is not None:
+        group_committer.close()
+    # Joined off the loop, which the re-scorer may still need to release its slot
+    await asyncio.get_running_loop().run_in_executor(None, rescorer.close)
+    rescorer.engine.dispose()
+    await engine.dispose()
+
+
+def conditional_job_view(cache=None):
+    """Async counterpart of http_cache.conditional_job_view"""
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(job_id, *args, **kwargs):
+            async with Session() as session:
+                version = await session.scalar(job_version_query(job_id))
+            if version is None:
+                return await view(job_id, *args, **kwargs)
+
+            etag, key, response = precondition_response(request, cache, job_id, version, Response)
+            if response is None:
+                response = await make_response(await view(job_id, *args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                cache_response(cache, key, response, await response.get_data())
+            return tag_response(response, etag)
+        return wrapper
+    return decorator
+
+
+@app.route("/api/jobs", methods=["POST"])
+@admission.limit("upload")
+async def create_job():
+    """Create a new job posting"""
+    try:
+        data = await request.get_json()
+        if not data or "title" not in data or "description" not in data:
+            return jsonify({"error": "Missing required fields"}), 400
+
+        # Generate JD summary
+        summary = await run_in("parse", parse_worker.summarize_jd, data["description"])
+
+        # Create job record
+        async with Session() as session:
+            job = Job(
+                title=data["title"],
+                description=data["description"],
+                summary=summary
+            )
+            session.add(job)
+            await session.commit()
+
+        return jsonify({
+            "job_id": job.job_id,
+            "message": "Job created successfully"
+        }), 201
+
+    except Exception as e:
+        logger.error(f"Error creating job: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@app.route("/api/jobs/<int:job_id>", methods=["PUT"])
+@admission.limit("upload")
+async def update_job(job_id):
+    """Edit a job posting, re-scoring its applications if the JD summary changes"""
+    try:
+        data = await request.get_json()
+        if not data or not ("title" in data or "description" in data):
+            return jsonify({"error": "Missing required fields"}), 400
+
+        async with Session() as session:
+            job = await session.get(Job, job_id)
+            if not job:
+                return jsonify({"error": "Job not found"}), 404
+
+        # Generate JD summary for the new description
+        summary = None
+        if "description" in data:
+            summary = await run_in("parse", parse_worker.summarize_jd, data["description"])
+
+        async with Session() as session:
+            job = await session.get(Job, job_id)
+            rescoring = apply_job_update(job, data.get("title"), data.get("description"), summary)
+            await session.commit()
+        if rescoring:
+            rescorer.submit(job_id)
+
+        return jsonify({
+            "job_id": job_id,
+            "rescoring": rescoring,
+            "message": "Job updated successfully"
+        })
+
+    except Exception as e:
+        logger.error(f"Error updating job: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@app.route("/api/jobs/<int:job_id>/rescoring", methods=["GET"])
+async def rescoring_status(job_id):
+    """Progress of the job's latest background re-score"""
+    status = rescorer.status(job_id)
+    if status is None:
+        return jsonify({"state": "idle"})
+    return jsonify(status)
+
+
+@app.route("/api/apply", methods=["POST"])
+@admission.limit("upload")
+async def apply_to_job():
+    """Process a job application"""
+    try:
+        files = await request.files
+        form = await request.form
+        if "resume" not in files:
+            return jsonify({"error": "No resume file provided"}), 400
+
+        resume_file = files["resume"]
+        if resume_file.filename == "":
+            return jsonify({"error": "No selected file"}), 400
+
+        # Get job details
+        async with Session() as session:
+            job = await session.get(Job, int(form["job_id"]))
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
+        # Save resume
+        resume_path = os.path.join(app.config["UPLOAD_FOLDER"], resume_file.filename)
+        await resume_file.save(resume_path)
+
+        # Parse resume and compute its MinHash signature off the event loop
+        parsed_data, signature_bytes = await run_in("parse", parse_worker.parse_resume, resume_path)
+        signature = deduplicator.from_bytes(signature_bytes)
+
+        # Link to an earlier near-identical resume if any, reusing its score for this job
+        async with Session() as session:
+            duplicate_of = await session.run_sync(find_duplicate, deduplicator, signature)
+
+        jd_summary = job.summary
+        while True:
+            async with Session() as session:
+                match_score = await session.run_sync(known_match_score, duplicate_of, job.job_id, jd_summary)
+
+            # Compute match score unless it was reused; no DB connection is held during inference
+            if match_score is None:
+                async with admission.admitted_async("inference"):
+                    match_score = await run_in("inference", matcher.compute_match, jd_summary, parsed_data)
+
+            # Create candidate and application records in a single transaction
+            write = partial(
+                add_application,
+                deduplicator=deduplicator,
+                job_id=job.job_id,
+                name=form["name"],
+                email=form["email"],
+                resume_path=resume_path,
+                parsed_data=parsed_data,
+                signature=signature,
+                duplicate_of=duplicate_of,
+                match_score=match_score,
+                jd_summary=jd_summary
+            )
+            try:
+                if group_committer is not None:
+                    application = await asyncio.wrap_future(group_committer.submit(write))
+                else:
+                    async with Session() as session:
+                        application = await session.run_sync(write)
+                        await session.commit()
+                break
+            except StaleSummary:
+                # The job was edited while scoring; score against its new summary
+                async with Session() as session:
+                    jd_summary = await session.scalar(select(Job.summary).where(Job.job_id == job.job_id))
+
+        return jsonify({
+            "application_id": application.application_id,
+            "match_score": match_score,
+            "duplicate_of": duplicate_of,
+            "message": "Application submitted successfully"
+        }), 201
+
+    except Overloaded as e:
+        return admission.overloaded_response(e)
+    except Exception as e:
+        logger.error(f"Error processing application: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@app.route("/api/jobs/<int:job_id>/candidates", methods=["GET"])
+@conditional_job_view(response_cache)
+async def get_candidates(job_id):
+    """Get candidates for a job, best match first (see services.candidate_page)"""
+    try:
+        async with Session() as session:
+            job, applications, headers = await session.run_sync(candidate_page_rows, job_id, request.args)
+        if not job:
+            return jsonify([]), 200, headers
+
+        # Match details are built off the event loop
+        include_details = request.args.get("details", "1") != "0"
+        candidates = await run_in("inference", candidate_entries, matcher, job, applications, include_details)
+        return jsonify(candidates), 200, headers
+
+    except Exception as e:
+        logger.error(f"Error fetching candidates: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@app.route("/api/applications/<int:application_id>/match", methods=["GET"])
+async def get_match_details(application_id):
+    """Get match details for a single application"""
+    try:
+        async with Session() as session:
+            inputs = await session.run_sync(application_match_inputs, application_id)
+        if inputs is None:
+            return jsonify({"error": "Application not found"}), 404
+        match_details = await run_in("inference", matcher.get_match_details, *inputs)
+        return jsonify(match_details)
+
+    except Exception as e:
+        logger.error(f"Error fetching match details: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+
+async def encoded_candidates(job, encoder):
+    """Ranked candidates encoded chunk by chunk
+
+    Each chunk is read by keyset in its own short session, so a slow client
+    holds no pooled connection between chunks. Match details and encoding
+    run on the inference executor, off the event loop.
+    """
+    after = None
+    while True:
+        async with Session() as session:
+            rows = await session.run_sync(ranked_candidates_chunk, job, after)
+        data = await run_in("inference", encode_ranked_chunk, encoder, rows, job, matcher)
+        if data:
+            yield data.encode("utf-8") if isinstance(data, str) else data
+        if len(rows) < CHUNK_SIZE:
+            break
+        after = (rows[-1].match_score, rows[-1].application_id)
+    data = await run_in("inference", encoder.finish)
+    if data:
+        yield data.encode("utf-8") if isinstance(data, str) else data
+
+
+@app.route("/api/jobs/<int:job_id>/candidates/stream", methods=["GET"])
+@conditional_job_view()
+async def stream_candidates(job_id):
+    """Stream a job's ranked candidates as NDJSON, one candidate per line"""
+    try:
+        async with Session() as session:
+            job = await session.get(Job, job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
+        return Response(encoded_candidates(job, NdjsonEncoder()), mimetype="application/x-ndjson")
+
+    except Exception as e:
+        logger.error(f"Error streaming candidates: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@app.route("/api/jobs/<int:job_id>/candidates/export", methods=["GET"])
+@conditional_job_view()
+async def export_candidates(job_id):
+    """Export a job's ranked candidates as CSV or Parquet for ATS handoff"""
+    try:
+        export_format = request.args.get("format", "csv").lower()
+        if export_format not in ("csv", "parquet"):
+            return jsonify({"error": "Unsupported export format"}), 400
+        if export_format == "parquet" and pa is None:
+            return jsonify({"error": "Parquet export requires pyarrow"}), 501
+
+        async with Session() as session:
+            job = await session.get(Job, job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
+        if export_format == "csv":
+            encoder, mimetype = CsvEncoder(), "text/csv"
+        else:
+            encoder, mimetype = ParquetEncoder(), "application/vnd.apache.parquet"
+
+        return Response(
+            encoded_candidates(job, encoder),
+            mimetype=mimetype,
+            headers={
+                "Content-Disposition": f"attachment; filename=job_{job_id}_candidates.{export_format}"
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Error exporting candidates: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@app.route("/api/candidates/search", methods=["GET"])
+async def search():
+    """Full-text search over the candidate pool"""
+    try:
+        query = request.args.get("q", "").strip()
+        if not query:
+            return jsonify({"error": "Missing search query"}), 400
+
+        job_id = request.args.get("job_id", type=int)
+        min_score = request.args.get("min_score", type=float)
+        page = max(request.args.get("page", 1, type=int), 1)
+        per_page = min(max(request.args.get("per_page", 20, type=int), 1), 100)
+        cursor = request.args.get("cursor")
+        if cursor is not None:
+            try:
+                parse_cursor(cursor)
+            except ValueError:
+                return jsonify({"error": "Invalid cursor"}), 400
+
+        try:
+            async with Session() as session:
+                results = await session.run_sync(
+                    search_candidates,
+                    query,
+                    job_id=job_id,
+                    min_score=min_score,
+                    page=page,
+                    per_page=per_page,
+                    cursor=cursor
+                )
+        except OperationalError as e:
+            # FTS5 reports malformed MATCH expressions as operational errors
+            logger.warning(f"Invalid search query {query!r}: {str(e)}")
+            return jsonify({"error": "Invalid search query"}), 400
+
+        return jsonify(results)
+
+    except Exception as e:
+        logger.error(f"Error searching candidates: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@app.route("/api/schedule", methods=["POST"])
+@admission.limit("scheduling")
+async def schedule_interview():
+    """Schedule an interview"""
+    try:
+        data = await request.get_json()
+        application_id = data.get("application_id")
+
+        if not application_id:
+            return jsonify({"error": "Missing application_id"}), 400
+
+        # Get application details
+        async with Session() as session:
+            application = await session.get(
+                Application,
+                application_id,
+                options=[joinedload(Application.candidate), joinedload(Application.job)]
+            )
+            if not application:
+                return jsonify({"error": "Application not found"}), 404
+            candidate_email = application.candidate.email
+            job_title = application.job.title
+
+        # Send the invitation on the email executor, holding no DB connection
+        result = await run_in("email", scheduler.schedule, application_id, candidate_email, job_title)
+        if result["status"] != "scheduled":
+            return jsonify({"error": "Failed to schedule interview"}), 500
+
+        async with Session() as session:
+            # Create interview record
+            interview = Interview(
+                application_id=application_id,
+                interview_time=datetime.fromisoformat(result["interview_time"]),
+                status="scheduled"
+            )
+            session.add(interview)
+
+            # Update application status
+            application = await session.get(Application, application_id)
+            application.status = "interview_scheduled"
+            await session.commit()
+
+        return jsonify({
+            "interview_id": interview.interview_id,
+            "job_id": application.job_id,
+            "interview_time": result["interview_time"],
+            "message": "Interview scheduled successfully"
+        }), 201
+
+    except Exception as e:
+        logger.error(f"Error scheduling interview: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+
+@app.route("/api/metrics/admission", methods=["GET"])
+async def admission_metrics():
+    """Queue depth, admissions and rejections per endpoint class"""
+    return jsonify(admission.metrics())
+
+
+@app.route("/api/metrics/cache", methods=["GET"])
+async def cache_metrics():
+    """Response cache size and hit rate"""
+    return jsonify(response_cache.stats())
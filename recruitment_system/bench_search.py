@@ -0,0 +1,120 @@
+"""Latency of candidate full-text search on a large synthetic pool.
+
+Usage, from recruitment_system/:
+    python bench_search.py --candidates 1000000 --database /tmp/search_bench.db
+
+Builds (or reuses) a SQLite database with the given number of synthetic
+resumes in the candidates table and FTS5 index, one job with
+--applicants applications, then times search_candidates for a few query
+shapes: median and worst of --repeat runs, first page and a keyset page.
+"""
+import argparse
+import os
+import statistics
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from models import db
+from search_index import ensure_search_index, search_candidates, SEARCH_TABLE
+
+# Share of resumes mentioning each term; the rest of a resume is filler words
+TERM_RATES = {
+    "python": 0.5, "sql": 0.4, "java": 0.3, "aws": 0.3, "docker": 0.2,
+    "kafka": 0.1, "kubernetes": 0.1, "fintech": 0.05, "rust": 0.01
+}
+FILLER_WORDS = 5000
+WORDS_PER_RESUME = 60
+
+QUERIES = [
+    ("rare term", {"query": "rust"}),
+    ("two terms", {"query": "kafka AND fintech"}),
+    ("common term", {"query": "python"}),
+    ("job applicants", {"query": "python", "job_id": 1, "min_score": 0.5})
+]
+
+
+def build(engine, candidates, applicants, batch_size=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    db.metadata.create_all(engine)
+    ensure_search_index(engine)
+    terms = list(TERM_RATES)
+    rates = np.array(list(TERM_RATES.values()))
+    # Zipf-like filler vocabulary
+    weights = 1 / np.arange(1, FILLER_WORDS + 1)
+    weights /= weights.sum()
+
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO jobs (job_id, title, description, summary, version) "
+            "VALUES (1, 'Bench', 'Benchmark job', '{}', 0)"
+        ))
+        for start in range(1, candidates + 1, batch_size):
+            ids = range(start, min(start + batch_size, candidates + 1))
+            filler = rng.choice(FILLER_WORDS, size=(len(ids), WORDS_PER_RESUME), p=weights)
+            mentions = rng.random((len(ids), len(terms))) < rates
+            documents = [
+                " ".join([terms[t] for t in np.flatnonzero(mentions[row])] + [f"w{w}" for w in filler[row]])
+                for row in range(len(ids))
+            ]
+            connection.execute(
+                text("INSERT INTO candidates (candidate_id, name, email) VALUES (:id, :name, :email)"),
+                [{"id": i, "name": f"Candidate {i}", "email": f"c{i}@example.com"} for i in ids]
+            )
+            connection.execute(
+                text(f"INSERT INTO {SEARCH_TABLE} (rowid, processed_text, sections) VALUES (:id, :text, '')"),
+                [{"id": i, "text": document} for i, document in zip(ids, documents)]
+            )
+
+        applicant_ids = rng.choice(candidates, size=min(applicants, candidates), replace=False) + 1
+        connection.execute(
+            text("INSERT INTO applications (job_id, candidate_id, match_score, status) VALUES (1, :id, :score, 'applied')"),
+            [{"id": int(i), "score": float(s)} for i, s in zip(applicant_ids, rng.random(len(applicant_ids)))]
+        )
+
+
+def timed(session, repeat, **kwargs):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = search_candidates(session, **kwargs)
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=1000000)
+    parser.add_argument("--applicants", type=int, default=5000, help="applications to the benchmark job")
+    parser.add_argument("--database", default="search_bench.db", help="reused if it already exists")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{os.path.abspath(args.database)}")
+    if not os.path.exists(args.database):
+        start = time.monotonic()
+        build(engine, args.candidates, args.applicants)
+        print(f"Built {args.candidates} candidates in {time.monotonic() - start:.0f}s")
+
+    print(f"{'query':<16}{'matches':>10}{'p1 median ms':>14}{'p1 max ms':>11}{'next median ms':>16}")
+    with Session(engine) as session:
+        for label, kwargs in QUERIES:
+            matches = session.execute(
+                text(f"SELECT count(*) FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :query"),
+                {"query": kwargs["query"]}
+            ).scalar()
+            first, first_timings = timed(session, args.repeat, **kwargs)
+            next_timings = [0.0]
+            if first["next_cursor"]:
+                _, next_timings = timed(session, args.repeat, cursor=first["next_cursor"], **kwargs)
+            print(
+                f"{label:<16}{matches:>10}{statistics.median(first_timings):>14.1f}"
+                f"{max(first_timings):>11.1f}{statistics.median(next_timings):>16.1f}"
+            )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
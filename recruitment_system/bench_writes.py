@@ -0,0 +1,211 @@
+"""Write throughput of the application write path on SQLite.
+
+Usage, from recruitment_system/:
+    python bench_writes.py --threads 16 --applications 50
+
+Each thread submits applications the way /api/apply stores them, with model
+inference replaced by a short sleep, against a fresh temporary database:
+
+    baseline  default rollback journal, candidate and application in two commits
+    wal       WAL and busy timeout, one transaction per application
+    group     WAL and busy timeout, applications batched by GroupCommitter
+
+Reports applications per second, commits issued and "database is locked"
+failures for each mode.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from config import Config
+from models import db, Job, Candidate, Application
+from agents.deduplicator import Deduplicator
+from dedupe import find_duplicate, register_candidate
+from services import add_application, known_match_score
+from search_index import ensure_search_index
+from database import engine_options, configure_engine, GroupCommitter
+from synthetic_data import SKILLS, ROLES, DEGREES
+
+MODES = ("baseline", "wal", "group")
+
+
+def synthetic_parsed_data(rng, index):
+    """Parser output for a random resume, unique enough not to be deduplicated"""
+    skills = rng.sample(SKILLS, rng.randint(3, 8))
+    words = [f"candidate{index}", rng.choice(ROLES)] + skills + [
+        f"project{rng.randint(1, 10 ** 6)}" for _ in range(40)
+    ]
+    return json.dumps({
+        "processed_text": " ".join(words),
+        "skills": skills,
+        "education": [rng.choice(DEGREES)],
+        "sections": {"skills": ", ".join(skills)}
+    })
+
+
+def baseline_apply(engine, deduplicator, job_id, index, parsed_data, signature, inference_seconds):
+    """The old /api/apply: commit the candidate, run inference, commit the application"""
+    with Session(engine) as session:
+        duplicate_of = find_duplicate(session, deduplicator, signature)
+        candidate = Candidate(
+            name=f"Candidate {index}",
+            email=f"candidate{index}@example.com",
+            resume_path=f"bench/{index}.pdf",
+            parsed_data=parsed_data,
+            minhash=deduplicator.to_bytes(signature),
+            duplicate_of=duplicate_of
+        )
+        session.add(candidate)
+        session.flush()
+        if duplicate_of is None:
+            register_candidate(session, deduplicator, candidate.candidate_id, signature)
+        session.commit()
+
+        time.sleep(inference_seconds)
+        session.add(Application(job_id=job_id, candidate_id=candidate.candidate_id, match_score=0.5))
+        session.commit()
+
+
+def tuned_apply(engine, committer, deduplicator, job_id, index, parsed_data, signature, inference_seconds):
+    """The current /api/apply: reads and inference first, then one write transaction"""
+    with Session(engine) as session:
+        duplicate_of = find_duplicate(session, deduplicator, signature)
+        match_score = known_match_score(session, duplicate_of, job_id)
+
+    time.sleep(inference_seconds)
+    write = partial(
+        add_application,
+        deduplicator=deduplicator,
+        job_id=job_id,
+        name=f"Candidate {index}",
+        email=f"candidate{index}@example.com",
+        resume_path=f"bench/{index}.pdf",
+        parsed_data=parsed_data,
+        signature=signature,
+        duplicate_of=duplicate_of,
+        match_score=match_score if match_score is not None else 0.5
+    )
+    if committer is not None:
+        committer.run(write)
+    else:
+        with Session(engine) as session:
+            write(session)
+            session.commit()
+
+
+def run_mode(mode, threads, applications, inference_seconds, seed):
+    directory = tempfile.mkdtemp(prefix="bench_writes_")
+    url = f"sqlite:///{os.path.join(directory, 'recruitment.db')}"
+    config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+
+    if mode == "baseline":
+        # What app.py used before: SQLAlchemy defaults on a rollback-journal file
+        engine = create_engine(url)
+    else:
+        engine = create_engine(url, **engine_options(config, url))
+        configure_engine(engine, config["SQLITE_BUSY_TIMEOUT_MS"])
+
+    commits = [0]
+    commits_lock = threading.Lock()
+
+    @event.listens_for(engine, "commit")
+    def _count_commit(connection):
+        with commits_lock:
+            commits[0] += 1
+
+    db.metadata.create_all(engine)
+    ensure_search_index(engine)
+    with Session(engine) as session:
+        job = Job(title="Bench", description="Benchmark job", summary="{}")
+        session.add(job)
+        session.commit()
+        job_id = job.job_id
+    commits[0] = 0
+
+    committer = None
+    if mode == "group":
+        committer = GroupCommitter(
+            engine,
+            max_batch=config["GROUP_COMMIT_MAX_BATCH"],
+            max_delay=config["GROUP_COMMIT_MAX_DELAY"]
+        )
+
+    deduplicator = Deduplicator()
+    rng = random.Random(seed)
+    payloads = []
+    for index in range(threads * applications):
+        parsed_data = synthetic_parsed_data(rng, index)
+        signature = deduplicator.signature(json.loads(parsed_data)["processed_text"])
+        payloads.append((index, parsed_data, signature))
+
+    errors = {"locked": 0, "other": 0}
+    errors_lock = threading.Lock()
+
+    def submit(payload):
+        try:
+            if mode == "baseline":
+                baseline_apply(engine, deduplicator, job_id, *payload, inference_seconds)
+            else:
+                tuned_apply(engine, committer, deduplicator, job_id, *payload, inference_seconds)
+        except OperationalError as e:
+            with errors_lock:
+                errors["locked" if "locked" in str(e) else "other"] += 1
+        except Exception:
+            with errors_lock:
+                errors["other"] += 1
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(submit, payloads))
+    elapsed = time.monotonic() - start
+
+    if committer is not None:
+        committer.close()
+    with Session(engine) as session:
+        stored = session.query(Application).count()
+    engine.dispose()
+    shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        "mode": mode,
+        "applications": len(payloads),
+        "stored": stored,
+        "seconds": round(elapsed, 3),
+        "applications_per_second": round(stored / elapsed, 1),
+        "commits": commits[0],
+        "locked_errors": errors["locked"],
+        "other_errors": errors["other"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--applications", type=int, default=50, help="applications per thread")
+    parser.add_argument("--inference-ms", type=float, default=20.0, help="simulated model time per application")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'apps/s':>10}{'stored':>9}{'commits':>9}{'locked':>8}{'other':>7}")
+    for mode in args.modes.split(","):
+        result = run_mode(mode, args.threads, args.applications, args.inference_ms / 1000, args.seed)
+        print(
+            f"{result['mode']:<10}{result['applications_per_second']:>10}{result['stored']:>9}"
+            f"{result['commits']:>9}{result['locked_errors']:>8}{result['other_errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Check background re-scoring against applications racing a job edit.
+
+Usage, from recruitment_system/:
+    python check_rescoring.py
+
+Runs the apply and job update paths of services.py and the Rescorer on a
+temporary SQLite database, with a keyword matcher in place of the model:
+
+    stale apply     an application scored against the old summary and
+                    written after the edit is refused with StaleSummary,
+                    and scored again against the new one
+    no rework       applications scored against the new summary during a
+                    pass are not scored a second time by the Rescorer
+    duplicates      a near-duplicate does not reuse its original's score
+                    from before the edit
+    close           Rescorer.close() stops a long pass between batches
+
+Exits non-zero if any check fails.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from config import Config
+from models import db, Job, Application
+from agents.deduplicator import Deduplicator
+from database import configure_engine
+from rescoring import Rescorer
+from services import StaleSummary, add_application, apply_job_update, known_match_score
+
+
+class KeywordMatcher:
+    """Share of the JD's words found in the resume; optionally slow"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def compute_match(self, jd_summary, parsed_resume):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        jd_words = set(json.loads(jd_summary)["processed_text"].split())
+        resume_words = set(json.loads(parsed_resume)["processed_text"].split())
+        return len(jd_words & resume_words) / len(jd_words)
+
+
+def summary(text):
+    return json.dumps({"skills": [], "qualifications": [], "processed_text": text})
+
+
+def resume(text):
+    return json.dumps({"skills": [], "education": [], "processed_text": text, "sections": {}})
+
+
+def apply(engine, deduplicator, matcher, job_id, index, text, duplicate_of=None, jd_summary=None):
+    """The /api/apply scoring and write loop, optionally starting from a given summary"""
+    parsed_data = resume(text)
+    with Session(engine) as session:
+        if jd_summary is None:
+            jd_summary = session.get(Job, job_id).summary
+    while True:
+        with Session(engine) as session:
+            match_score = known_match_score(session, duplicate_of, job_id, jd_summary)
+        if match_score is None:
+            match_score = matcher.compute_match(jd_summary, parsed_data)
+        try:
+            with Session(engine, expire_on_commit=False) as session:
+                application = add_application(
+                    session, deduplicator, job_id, f"Candidate {index}", f"c{index}@example.com",
+                    f"check/{index}.pdf", parsed_data, deduplicator.signature(text),
+                    duplicate_of, match_score, jd_summary=jd_summary
+                )
+                session.commit()
+                return application
+        except StaleSummary:
+            with Session(engine) as session:
+                jd_summary = session.get(Job, job_id).summary
+
+
+def edit_job(engine, rescorer, job_id, text):
+    with Session(engine) as session:
+        job = session.get(Job, job_id)
+        rescoring = apply_job_update(job, summary=summary(text))
+        session.commit()
+    if rescoring and rescorer is not None:
+        rescorer.submit(job_id)
+
+
+def wait_done(rescorer, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = rescorer.status(job_id)
+        if status and status["state"] in ("done", "failed"):
+            return status
+        time.sleep(0.01)
+    return rescorer.status(job_id)
+
+
+def scores(engine, job_id):
+    with Session(engine) as session:
+        return {
+            application_id: match_score
+            for application_id, match_score in session.query(
+                Application.application_id, Application.match_score
+            ).filter_by(job_id=job_id)
+        }
+
+
+def new_job(engine, text):
+    with Session(engine) as session:
+        job = Job(title="Check", description=text, summary=summary(text))
+        session.add(job)
+        session.commit()
+        return job.job_id
+
+
+def check_stale_apply(engine, deduplicator):
+    matcher = KeywordMatcher()
+    rescorer = Rescorer(engine, matcher, batch_size=2)
+    try:
+        job_id = new_job(engine, "python sql")
+        for index in range(3):
+            apply(engine, deduplicator, matcher, job_id, index, f"python rust kafka person{index}")
+
+        with Session(engine) as session:
+            old_summary = session.get(Job, job_id).summary
+        edit_job(engine, rescorer, job_id, "rust kafka")
+        # Read the summary before the edit, written after it
+        late = apply(engine, deduplicator, matcher, job_id, 10, "rust kafka late", jd_summary=old_summary)
+        wait_done(rescorer, job_id)
+        return scores(engine, job_id)[late.application_id] == 1.0
+    finally:
+        rescorer.close()
+
+
+def check_no_rework(engine, deduplicator):
+    matcher = KeywordMatcher(delay=0.01)
+    rescorer = Rescorer(engine, matcher, batch_size=5)
+    try:
+        job_id = new_job(engine, "python sql")
+        for index in range(20):
+            apply(engine, deduplicator, matcher, job_id, 100 + index, f"python person{100 + index}")
+
+        matcher.calls = 0
+        edit_job(engine, rescorer, job_id, "python rust")
+        for index in range(10):
+            apply(engine, deduplicator, matcher, job_id, 200 + index, f"python rust person{200 + index}")
+        status = wait_done(rescorer, job_id)
+        # 20 re-scored plus 10 scored once by apply, none of them twice
+        return status["state"] == "done" and status["rescored"] == 20 and matcher.calls == 30
+    finally:
+        rescorer.close()
+
+
+def check_duplicates(engine, deduplicator):
+    matcher = KeywordMatcher()
+    job_id = new_job(engine, "python sql")
+    original = apply(engine, deduplicator, matcher, job_id, 300, "python rust kafka original")
+    with Session(engine) as session:
+        original_id = session.get(Application, original.application_id).candidate_id
+
+    # No re-score yet, so the original keeps its score for the old summary
+    edit_job(engine, None, job_id, "rust kafka")
+    duplicate = apply(
+        engine, deduplicator, matcher, job_id, 301, "python rust kafka original", duplicate_of=original_id
+    )
+    return scores(engine, job_id)[duplicate.application_id] == 1.0
+
+
+def check_close(engine, deduplicator):
+    matcher = KeywordMatcher()
+    job_id = new_job(engine, "python sql")
+    for index in range(40):
+        apply(engine, deduplicator, matcher, job_id, 400 + index, f"python person{400 + index}")
+
+    matcher.delay = 0.05
+    rescorer = Rescorer(engine, matcher, batch_size=5)
+    edit_job(engine, rescorer, job_id, "python rust")
+    time.sleep(0.1)
+    start = time.monotonic()
+    rescorer.close()
+    # A full pass would take 40 * 0.05s
+    return time.monotonic() - start < 0.5 and rescorer.status(job_id)["state"] != "done"
+
+
+CHECKS = [
+    ("stale apply", check_stale_apply),
+    ("no rework", check_no_rework),
+    ("duplicates", check_duplicates),
+    ("close", check_close)
+]
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix="check_rescoring_")
+    engine = create_engine(f"sqlite:///{os.path.join(directory, 'recruitment.db')}")
+    configure_engine(engine, Config.SQLITE_BUSY_TIMEOUT_MS)
+    db.metadata.create_all(engine)
+    deduplicator = Deduplicator()
+
+    failed = 0
+    try:
+        for label, check in CHECKS:
+            passed = check(engine, deduplicator)
+            failed += not passed
+            print(f"{label:<14}{'ok' if passed else 'FAILED'}")
+    finally:
+        engine.dispose()
+        shutil.rmtree(directory, ignore_errors=True)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Async drivers used by asgi_app.py for each sync database backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql"
+}
+
+
+def engine_options(config, url):
+    """SQLAlchemy create_engine options for a database URL from config.Config"""
+    options = {
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_pre_ping": True
+    }
+    if make_url(url).get_backend_name() == "sqlite":
+        # The driver-level lock timeout, in seconds; busy_timeout is also set per connection
+        options["connect_args"] = {"timeout": config["SQLITE_BUSY_TIMEOUT_MS"] / 1000}
+    return options
+
+
+def configure_engine(engine, busy_timeout_ms):
+    """Put every new SQLite connection in WAL mode with a busy timeout
+
+    WAL lets readers proceed while a write is in progress, and the busy
+    timeout makes a blocked writer wait for the lock instead of failing
+    with "database is locked". Other backends are left untouched.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        # Durable at checkpoints; a crash can lose only the last transactions
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+
+def async_database_url(url, instance_path):
+    """Async-driver form of a sync database URL
+
+    Relative SQLite paths are resolved against the instance folder, the way
+    Flask-SQLAlchemy does for app.py, so both servers share one file.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}; set ASYNC_DATABASE_URL")
+    if backend == "sqlite" and url.database and url.database != ":memory:" and not os.path.isabs(url.database):
+        url = url.set(database=os.path.join(instance_path, url.database))
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+class GroupCommitter:
+    """Batches writes from many threads into few transactions
+
+    submit() queues a function taking a Session and returns a Future. A
+    single writer thread runs up to max_batch queued functions in one
+    transaction, waiting at most max_delay seconds for a batch to fill, so
+    N concurrent writers cost about one commit instead of N. If a batch
+    fails to commit, its functions are retried one transaction each so a
+    bad write only fails its own Future.
+    """
+
+    def __init__(self, engine, max_batch=64, max_delay=0.005):
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.writes = 0
+        self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+        self._thread.start()
+
+    def submit(self, write):
+        future = Future()
+        self.queue.put((write, future))
+        return future
+
+    def run(self, write):
+        """Submit a write and wait for its committed result"""
+        return self.submit(write).result()
+
+    def close(self):
+        self.queue.put(None)
+        self._thread.join()
+
+    def _next_batch(self):
+        item = self.queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        while len(batch) < self.max_batch:
+            try:
+                item = self.queue.get(timeout=self.max_delay)
+            except queue.Empty:
+                break
+            if item is None:
+                self.queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _commit(self, batch):
+        with Session(self.engine, expire_on_commit=False) as session:
+            results = [write(session) for write, _ in batch]
+            session.commit()
+        return results
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                results = self._commit(batch)
+            except Exception as e:
+                logger.warning(f"Group commit of {len(batch)} writes failed, retrying individually: {str(e)}")
+                for item in batch:
+                    try:
+                        item[1].set_result(self._commit([item])[0])
+                    except Exception as item_error:
+                        item[1].set_exception(item_error)
+                continue
+
+            self.batches += 1
+            self.writes += len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
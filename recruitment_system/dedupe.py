@@ -0,0 +1,129 @@
+"""Near-duplicate candidate detection backed by the candidate_lsh table.
+
+Run as a script to dedupe the existing candidates table in batch:
+    python dedupe.py
+"""
+import logging
+from flask import Flask
+from sqlalchemy import tuple_
+from models import db, Candidate, LshBucket, Application
+from parsed_storage import decompress_payload
+from agents.deduplicator import Deduplicator
+from schema import upgrade_schema
+from config import Config
+from database import engine_options, configure_engine
+
+logger = logging.getLogger(__name__)
+
+
+def find_duplicate(session, deduplicator, signature, exclude_id=None):
+    """Return the original candidate_id a signature most likely duplicates, or None
+
+    Only candidates sharing at least one LSH bucket are compared, so the cost
+    depends on the bucket sizes and not on the size of the pool.
+    """
+    if signature is None:
+        return None
+
+    keys = list(enumerate(deduplicator.band_keys(signature)))
+    candidate_ids = {
+        row.candidate_id
+        for row in session.query(LshBucket.candidate_id)
+        .filter(tuple_(LshBucket.band, LshBucket.bucket).in_(keys))
+        .distinct()
+    }
+    candidate_ids.discard(exclude_id)
+    if not candidate_ids:
+        return None
+
+    best_id, best_similarity = None, deduplicator.threshold
+    rows = session.query(Candidate.candidate_id, Candidate.minhash).filter(
+        Candidate.candidate_id.in_(candidate_ids)
+    )
+    for candidate_id, minhash in rows:
+        similarity = deduplicator.similarity(signature, deduplicator.from_bytes(minhash))
+        if similarity >= best_similarity:
+            best_id, best_similarity = candidate_id, similarity
+    return best_id
+
+
+def register_candidate(session, deduplicator, candidate_id, signature):
+    """Add an original candidate's signature to the LSH index"""
+    if signature is None:
+        return
+    for band, bucket in enumerate(deduplicator.band_keys(signature)):
+        session.add(LshBucket(band=band, bucket=bucket, candidate_id=candidate_id))
+
+
+def reusable_score(session, original_id, job_id, scored_summary=None):
+    """Match score already computed for this job by the original or one of its duplicates
+
+    With scored_summary, only a score computed against that summary (see
+    rescoring.summary_key) is reused.
+    """
+    linked_ids = session.query(Candidate.candidate_id).filter(
+        (Candidate.candidate_id == original_id) | (Candidate.duplicate_of == original_id)
+    )
+    query = session.query(Application).filter(
+        Application.job_id == job_id,
+        Application.candidate_id.in_(linked_ids),
+        Application.match_score.isnot(None)
+    )
+    if scored_summary is not None:
+        query = query.filter(Application.scored_summary == scored_summary)
+    application = query.first()
+    return application.match_score if application else None
+
+
+def dedupe_all(session, deduplicator, batch_size=500):
+    """Rebuild signatures and the LSH index for every candidate, oldest first
+
+    The earliest candidate of each near-duplicate group stays the original,
+    later ones are linked to it through duplicate_of.
+    """
+    session.query(LshBucket).delete()
+    session.query(Candidate).update({Candidate.duplicate_of: None})
+    session.commit()
+
+    duplicates = 0
+    last_id = 0
+    while True:
+        rows = session.query(Candidate.candidate_id, Candidate.parsed_blob).filter(
+            Candidate.candidate_id > last_id
+        ).order_by(Candidate.candidate_id).limit(batch_size).all()
+        if not rows:
+            break
+
+        for candidate_id, parsed_blob in rows:
+            signature = deduplicator.signature(decompress_payload(parsed_blob).get('processed_text', ''))
+            original_id = find_duplicate(session, deduplicator, signature, exclude_id=candidate_id)
+            session.query(Candidate).filter_by(candidate_id=candidate_id).update({
+                Candidate.minhash: deduplicator.to_bytes(signature),
+                Candidate.duplicate_of: original_id
+            })
+            if original_id is None:
+                register_candidate(session, deduplicator, candidate_id, signature)
+            else:
+                duplicates += 1
+            # Later rows in the batch must see this one in the index
+            session.flush()
+
+        session.commit()
+        last_id = rows[-1][0]
+
+    return duplicates
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config, app.config["SQLALCHEMY_DATABASE_URI"])
+    db.init_app(app)
+
+    with app.app_context():
+        configure_engine(db.engine, app.config["SQLITE_BUSY_TIMEOUT_MS"])
+        db.create_all()
+        upgrade_schema(db.engine)
+        count = dedupe_all(db.session, Deduplicator())
+        logger.info(f"Linked {count} near-duplicate candidates")
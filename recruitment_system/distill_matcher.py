@@ -0,0 +1,245 @@
+"""Distill the DistilBERT matcher into a small linear student.
+
+Usage, from recruitment_system/:
+    python distill_matcher.py --synthetic-jobs 40 --synthetic-resumes 120
+
+Pairs every job with every candidate in the local database, plus synthetic
+JDs and resume PDFs run through the same parsing agents, labels each pair
+with the current Matcher, and fits a ridge regression over hashed pair
+features to the teacher's logits. A share of the jobs is held out to
+report rank correlation with the teacher and the per-pair latency of both.
+Runs on CPU and needs no network access.
+
+Serve the student with MATCHER_BACKEND=student.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+from scipy.stats import spearmanr
+from sklearn.linear_model import Ridge
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, undefer
+
+from models import Job, Candidate
+from schema import upgrade_schema
+from agents.jd_summarizer import JDSummarizer
+from agents.resume_parser import ResumeParserAgent
+from agents.matcher import Matcher
+from agents.student_matcher import StudentMatcher, make_vectorizer, pair_features, score_to_logit
+from synthetic_data import synthetic_job_description, synthetic_resume
+
+logger = logging.getLogger(__name__)
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATABASE_URL = f"sqlite:///{os.path.join(current_dir, 'instance', 'recruitment.db')}"
+DEFAULT_TEACHER_PATH = os.path.join(os.path.dirname(current_dir), 'distilbert_resume_matcher')
+DEFAULT_STUDENT_PATH = os.path.join(os.path.dirname(current_dir), 'student_matcher')
+
+
+def local_pairs(database_url, max_pairs, rng):
+    """(group, jd_summary, parsed_resume) for every job and candidate in the database
+
+    The database is upgraded to the current schema first, as the app does at
+    startup. A database without the app's tables contributes no pairs.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and not os.path.exists(url.database or ""):
+        logger.warning(f"No local corpus: {url.database} does not exist")
+        return []
+
+    engine = create_engine(database_url)
+    try:
+        if not inspect(engine).has_table("candidates"):
+            logger.warning(f"No local corpus: {database_url} has no candidates table")
+            return []
+        upgrade_schema(engine)
+        with Session(engine) as session:
+            jobs = session.query(Job.job_id, Job.summary).all()
+            resumes = [json.loads(candidate.parsed_data) for candidate in session.query(Candidate).options(
+                undefer(Candidate.parsed_blob)
+            )]
+    finally:
+        engine.dispose()
+
+    pairs = [
+        (f"local:{job_id}", json.loads(summary), resume)
+        for job_id, summary in jobs if summary
+        for resume in resumes
+    ]
+    if len(pairs) > max_pairs:
+        pairs = rng.sample(pairs, max_pairs)
+    return pairs
+
+
+def synthetic_pairs(job_count, resume_count, rng):
+    """Synthetic JDs and resume PDFs, parsed the way the API parses uploads"""
+    jd_summarizer = JDSummarizer()
+    resume_parser = ResumeParserAgent()
+    summaries = [json.loads(jd_summarizer.summarize(synthetic_job_description(rng))) for _ in range(job_count)]
+
+    resumes = []
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(resume_count):
+            path = os.path.join(directory, f"resume_{index}.pdf")
+            with open(path, "wb") as f:
+                f.write(synthetic_resume(rng, index))
+            resumes.append(json.loads(resume_parser.parse(path)))
+
+    return [
+        (f"synthetic:{index}", summary, resume)
+        for index, summary in enumerate(summaries)
+        for resume in resumes
+    ]
+
+
+def label_pairs(teacher, pairs):
+    """Teacher match score for every pair"""
+    scores = []
+    start = time.monotonic()
+    for count, (_, jd_summary, parsed_resume) in enumerate(pairs, start=1):
+        scores.append(teacher.compute_match(jd_summary, parsed_resume))
+        if count % 500 == 0:
+            logger.info(f"Labelled {count}/{len(pairs)} pairs in {time.monotonic() - start:.0f}s")
+    return scores
+
+
+def load_labels(path):
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    pairs = [(r["group"], r["jd_summary"], r["parsed_resume"]) for r in records]
+    return pairs, [r["score"] for r in records]
+
+
+def save_labels(path, pairs, scores):
+    with open(path, "w") as f:
+        for (group, jd_summary, parsed_resume), score in zip(pairs, scores):
+            f.write(json.dumps({
+                "group": group,
+                "jd_summary": jd_summary,
+                "parsed_resume": parsed_resume,
+                "score": score
+            }) + "\n")
+
+
+def split_by_group(pairs, holdout, rng):
+    """Train and held-out pair indices, holding out whole jobs"""
+    groups = sorted({group for group, _, _ in pairs})
+    rng.shuffle(groups)
+    held_out = set(groups[:max(1, int(len(groups) * holdout))]) if len(groups) > 1 else set()
+    train = [i for i, (group, _, _) in enumerate(pairs) if group not in held_out]
+    test = [i for i, (group, _, _) in enumerate(pairs) if group in held_out]
+    return train, test
+
+
+def per_pair_latency(score, pairs):
+    """Mean milliseconds per compute_match call"""
+    start = time.perf_counter()
+    for _, jd_summary, parsed_resume in pairs:
+        score(json.dumps(jd_summary), json.dumps(parsed_resume))
+    return (time.perf_counter() - start) * 1000 / len(pairs)
+
+
+def evaluate(pairs, teacher_scores, student_scores):
+    """Agreement between student and teacher scores on held-out pairs"""
+    teacher_scores = np.asarray(teacher_scores)
+    student_scores = np.asarray(student_scores)
+
+    groups = {}
+    for index, (group, _, _) in enumerate(pairs):
+        groups.setdefault(group, []).append(index)
+
+    # Candidates are ranked per job, so per-job correlation is what matters
+    job_correlations = []
+    for indices in groups.values():
+        if len(indices) > 2 and np.ptp(teacher_scores[indices]) > 0 and np.ptp(student_scores[indices]) > 0:
+            job_correlations.append(spearmanr(teacher_scores[indices], student_scores[indices])[0])
+
+    return {
+        "pairs": len(pairs),
+        "jobs": len(groups),
+        "spearman": float(spearmanr(teacher_scores, student_scores)[0]),
+        "mean_job_spearman": float(np.mean(job_correlations)) if job_correlations else None,
+        "mean_abs_error": float(np.mean(np.abs(teacher_scores - student_scores)))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL, help="local corpus source")
+    parser.add_argument("--max-local-pairs", type=int, default=20000)
+    parser.add_argument("--synthetic-jobs", type=int, default=40)
+    parser.add_argument("--synthetic-resumes", type=int, default=120)
+    parser.add_argument("--labels", help="JSONL of labelled pairs; reused if it exists, written otherwise")
+    parser.add_argument("--teacher-path", default=DEFAULT_TEACHER_PATH)
+    parser.add_argument("--output", default=DEFAULT_STUDENT_PATH)
+    parser.add_argument("--n-features", type=int, default=2 ** 18)
+    parser.add_argument("--max-words", type=int, default=400, help="words of JD + resume the student reads")
+    parser.add_argument("--alpha", type=float, default=1.0, help="ridge regularization")
+    parser.add_argument("--holdout", type=float, default=0.2, help="share of jobs held out for the report")
+    parser.add_argument("--latency-samples", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    rng = random.Random(args.seed)
+    # Labels from an untrained fallback model would be meaningless
+    teacher = Matcher(args.teacher_path, fallback=False)
+
+    if args.labels and os.path.exists(args.labels):
+        pairs, scores = load_labels(args.labels)
+        logger.info(f"Loaded {len(pairs)} labelled pairs from {args.labels}")
+    else:
+        pairs = local_pairs(args.database_url, args.max_local_pairs, rng)
+        pairs += synthetic_pairs(args.synthetic_jobs, args.synthetic_resumes, rng)
+        logger.info(f"Labelling {len(pairs)} pairs with the teacher")
+        scores = label_pairs(teacher, pairs)
+        if args.labels:
+            save_labels(args.labels, pairs, scores)
+
+    train, test = split_by_group(pairs, args.holdout, rng)
+    vectorizer = make_vectorizer(args.n_features)
+    features = vectorizer.transform(pair_features(jd, resume, args.max_words) for _, jd, resume in pairs)
+    targets = score_to_logit(scores)
+
+    model = Ridge(alpha=args.alpha)
+    model.fit(features[train], targets[train])
+    meta = {
+        "n_features": args.n_features,
+        "max_words": args.max_words,
+        "alpha": args.alpha,
+        "teacher": os.path.basename(os.path.normpath(args.teacher_path)),
+        "train_pairs": len(train)
+    }
+    StudentMatcher.save(args.output, model.coef_, model.intercept_, meta)
+    student = StudentMatcher(args.output)
+
+    report = {}
+    if test:
+        test_pairs = [pairs[i] for i in test]
+        student_scores = [student.compute_match(jd, resume) for _, jd, resume in test_pairs]
+        report = evaluate(test_pairs, [scores[i] for i in test], student_scores)
+
+        sample = rng.sample(test_pairs, min(args.latency_samples, len(test_pairs)))
+        report["teacher_ms_per_pair"] = per_pair_latency(teacher.compute_match, sample)
+        report["student_ms_per_pair"] = per_pair_latency(student.compute_match, sample)
+        report["speedup"] = report["teacher_ms_per_pair"] / report["student_ms_per_pair"]
+
+    # Retrain on every pair for the shipped model
+    model.fit(features, targets)
+    meta["train_pairs"] = len(pairs)
+    meta["report"] = report
+    StudentMatcher.save(args.output, model.coef_, model.intercept_, meta)
+
+    print(json.dumps(report, indent=2))
+    logger.info(f"Saved student matcher to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
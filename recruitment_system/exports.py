@@ -0,0 +1,221 @@
+import csv
+import io
+import json
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from models import Application, Candidate
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+CHUNK_SIZE = 500
+
+EXPORT_COLUMNS = [
+    "application_id", "candidate_id", "name", "email", "match_score", "status",
+    "matching_skills", "missing_skills", "matching_education", "missing_education"
+]
+
+LIST_COLUMNS = ("matching_skills", "missing_skills", "matching_education", "missing_education")
+
+
+def ranked_candidates_query(session, job):
+    """Scalar columns of a job's applications and candidates, best match first"""
+    return session.query(
+        Application.application_id,
+        Application.match_score,
+        Application.status,
+        Candidate.candidate_id,
+        Candidate.name,
+        Candidate.email,
+        Candidate.skills,
+        Candidate.education
+    ).join(Candidate, Candidate.candidate_id == Application.candidate_id).filter(
+        Application.job_id == job.job_id
+    ).order_by(
+        Application.match_score.desc().nulls_last(), Application.application_id
+    )
+
+
+def _candidate_entry(row, jd_summary, matcher):
+    match_details = matcher.get_match_details(
+        jd_summary,
+        {
+            "skills": json.loads(row.skills or '[]'),
+            "education": json.loads(row.education or '[]')
+        },
+        match_score=row.match_score
+    )
+    return {
+        "application_id": row.application_id,
+        "candidate_id": row.candidate_id,
+        "name": row.name,
+        "email": row.email,
+        "match_score": row.match_score,
+        "status": row.status,
+        "match_details": match_details
+    }
+
+
+def ranked_candidates_chunk(session, job, after=None, limit=CHUNK_SIZE):
+    """Up to limit ranked_candidates_query rows following the keyset after
+
+    after is the (match_score, application_id) of the previous chunk's last
+    row, or None for the first chunk. Each chunk is a fresh query that
+    starts where the last one ended, so callers need not hold a cursor or
+    connection open between chunks, deep chunks cost no more than the
+    first, and applications added or re-scored meanwhile do not shift the
+    rest of the export the way an OFFSET would.
+    """
+    query = ranked_candidates_query(session, job)
+    if after is not None:
+        match_score, application_id = after
+        if match_score is None:
+            query = query.filter(
+                Application.match_score.is_(None), Application.application_id > application_id
+            )
+        else:
+            query = query.filter(or_(
+                Application.match_score < match_score,
+                and_(Application.match_score == match_score, Application.application_id > application_id),
+                Application.match_score.is_(None)
+            ))
+    return query.limit(limit).all()
+
+
+def ranked_candidate_entries(rows, job, matcher):
+    """Entries for rows of ranked_candidates_query, with match details"""
+    jd_summary = json.loads(job.summary) if job.summary else {}
+    return [_candidate_entry(row, jd_summary, matcher) for row in rows]
+
+
+def ranked_candidate_chunks(engine, matcher, job, chunk_size=CHUNK_SIZE):
+    """Yield a job's candidates best match first, one list of entries per chunk
+
+    Each chunk is read by keyset in its own short session, so no pooled
+    connection (or, on SQLite, read snapshot) is held while a client reads
+    the stream.
+    """
+    after = None
+    while True:
+        with Session(engine) as session:
+            rows = ranked_candidates_chunk(session, job, after, chunk_size)
+        yield ranked_candidate_entries(rows, job, matcher)
+        if len(rows) < chunk_size:
+            return
+        after = (rows[-1].match_score, rows[-1].application_id)
+
+
+def encode_ranked_chunk(encoder, rows, job, matcher):
+    """encoder output for one chunk of ranked_candidates_query rows"""
+    return encoder.encode(ranked_candidate_entries(rows, job, matcher))
+
+
+def _flatten(entry):
+    """One export record per candidate, with list fields joined for tabular formats"""
+    record = {column: entry.get(column) for column in EXPORT_COLUMNS[:6]}
+    for column in LIST_COLUMNS:
+        record[column] = "; ".join(entry["match_details"].get(column, []))
+    return record
+
+
+# Incremental encoders: encode() turns a chunk of entries into output and
+# finish() returns whatever closes the document.
+class NdjsonEncoder:
+    def encode(self, entries):
+        return "".join(json.dumps(entry) + "\n" for entry in entries)
+
+    def finish(self):
+        return ""
+
+
+class CsvEncoder:
+    def __init__(self):
+        self.buffer = io.StringIO()
+        self.writer = csv.DictWriter(self.buffer, fieldnames=EXPORT_COLUMNS)
+        self.writer.writeheader()
+
+    def encode(self, entries):
+        for entry in entries:
+            self.writer.writerow(_flatten(entry))
+        data = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+    def finish(self):
+        return self.buffer.getvalue()
+
+
+class ParquetEncoder:
+    """Writes one Parquet row group per encoded chunk"""
+
+    def __init__(self):
+        if pa is None:
+            raise RuntimeError("Parquet export requires pyarrow")
+        self.schema = pa.schema([
+            ("application_id", pa.int64()),
+            ("candidate_id", pa.int64()),
+            ("name", pa.string()),
+            ("email", pa.string()),
+            ("match_score", pa.float64()),
+            ("status", pa.string())
+        ] + [(column, pa.string()) for column in LIST_COLUMNS])
+        self.sink = _DrainableBuffer()
+        self.writer = pq.ParquetWriter(self.sink, self.schema)
+
+    def encode(self, entries):
+        if entries:
+            records = [_flatten(entry) for entry in entries]
+            self.writer.write_table(pa.Table.from_pylist(records, schema=self.schema))
+        return self.sink.drain()
+
+    def finish(self):
+        self.writer.close()
+        return self.sink.drain()
+
+
+def encode_stream(encoder, chunks):
+    """Yield encoder output for each chunk of entries, then the closing output"""
+    for chunk in chunks:
+        yield encoder.encode(chunk)
+    yield encoder.finish()
+
+
+def ndjson_stream(chunks):
+    return encode_stream(NdjsonEncoder(), chunks)
+
+
+def csv_stream(chunks):
+    return encode_stream(CsvEncoder(), chunks)
+
+
+def parquet_stream(chunks):
+    return encode_stream(ParquetEncoder(), chunks)
+
+
+class _DrainableBuffer(io.RawIOBase):
+    """Write-only file object whose contents can be taken and discarded"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
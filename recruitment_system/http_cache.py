@@ -0,0 +1,120 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import request, make_response, Response
+from sqlalchemy import select
+from models import db, Job
+
+# Response headers kept with a cached body
+CACHED_HEADERS = ("Content-Type", "X-Total-Count")
+
+
+class ResponseCache:
+    """Thread-safe LRU of response bodies bounded by their total size in bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body, headers):
+        if len(body) > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.size -= len(self.entries.pop(key)[0])
+            self.entries[key] = (body, headers)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (evicted, _) = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+def job_etag(path, query_string, job_id, version):
+    """Strong ETag for one representation of a job's data at a given version"""
+    representation = f"{path}?{query_string.decode()}|{job_id}|{version}"
+    return hashlib.sha1(representation.encode("utf-8")).hexdigest()
+
+
+def job_version_query(job_id):
+    """Select of the job's version, for sync and async sessions alike"""
+    return select(Job.version).where(Job.job_id == job_id)
+
+
+def precondition_response(request, cache, job_id, version, response_class):
+    """ETag and cache key for a job read, plus a response if the view can be skipped
+
+    The response is a 304 when If-None-Match matches, or the cached body
+    for this version; otherwise None and the caller runs the view.
+    """
+    etag = job_etag(request.path, request.query_string, job_id, version)
+    key = (request.path, request.query_string, version)
+    if etag in request.if_none_match:
+        return etag, key, response_class(status=304)
+
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        body, headers = cached
+        return etag, key, response_class(body, headers=headers)
+    return etag, key, None
+
+
+def cache_response(cache, key, response, body):
+    if cache is not None:
+        headers = {k: response.headers[k] for k in CACHED_HEADERS if k in response.headers}
+        cache.put(key, body, headers)
+
+
+def tag_response(response, etag):
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def conditional_job_view(cache=None):
+    """Serve a job read endpoint with ETags, 304s and an optional body cache
+
+    Only the job's version is read before deciding, so a matching
+    If-None-Match or a cache hit never touches the candidate rows.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(job_id, *args, **kwargs):
+            version = db.session.scalar(job_version_query(job_id))
+            if version is None:
+                return view(job_id, *args, **kwargs)
+
+            etag, key, response = precondition_response(request, cache, job_id, version, Response)
+            if response is None:
+                response = make_response(view(job_id, *args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if not response.is_streamed:
+                    cache_response(cache, key, response, response.get_data())
+            return tag_response(response, etag)
+        return wrapper
+    return decorator
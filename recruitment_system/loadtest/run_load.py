@@ -0,0 +1,261 @@
+"""Stepped-concurrency load test for the recruitment API.
+
+Start the API with the fake Gmail service so scheduling does not hit Google:
+    FAKE_GMAIL=1 FAKE_GMAIL_LATENCY=0.2 FAKE_GMAIL_ERROR_RATE=0.02 python app.py
+
+Then, from recruitment_system/:
+    python -m loadtest.run_load --steps 1,2,4,8,16,32 --duration 30
+
+Each step runs closed-loop workers issuing a weighted mix of requests for the
+given duration, then reports throughput, latency percentiles and error rates.
+The saturation point is the last step whose throughput grew by at least 10%
+over the previous step with no more than 5% errors.
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from synthetic_data import synthetic_job_description, synthetic_resume
+
+# Share of each operation in the request mix
+DEFAULT_MIX = {
+    "create_job": 0.05,
+    "apply": 0.25,
+    "list_candidates": 0.60,
+    "schedule": 0.10
+}
+
+
+class LoadState:
+    """Jobs and applications created so far, shared by all workers"""
+
+    def __init__(self, seed):
+        self.lock = threading.Lock()
+        self.job_ids = []
+        self.application_ids = []
+        self.counter = itertools.count(1)
+        self.random = random.Random(seed)
+
+    def pick(self, items):
+        with self.lock:
+            return self.random.choice(items) if items else None
+
+    def add(self, items, value):
+        with self.lock:
+            items.append(value)
+
+
+class StepResult:
+    def __init__(self, concurrency):
+        self.concurrency = concurrency
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.shed = defaultdict(int)
+        self.elapsed = 0.0
+
+    def record(self, operation, latency, status):
+        with self.lock:
+            self.latencies[operation].append(latency)
+            if status in (429, 503):
+                self.shed[operation] += 1
+            elif status is None or status >= 400:
+                self.errors[operation] += 1
+
+    def summary(self):
+        all_latencies = sorted(itertools.chain.from_iterable(self.latencies.values()))
+        total = len(all_latencies)
+        errors = sum(self.errors.values())
+        shed = sum(self.shed.values())
+        ok = total - errors - shed
+        operations = {}
+        for operation, latencies in self.latencies.items():
+            latencies = sorted(latencies)
+            operations[operation] = {
+                "requests": len(latencies),
+                "errors": self.errors[operation],
+                "shed": self.shed[operation],
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p99_ms": percentile(latencies, 99) * 1000
+            }
+        return {
+            "concurrency": self.concurrency,
+            "requests": total,
+            "throughput_rps": ok / self.elapsed if self.elapsed else 0.0,
+            "error_rate": errors / total if total else 0.0,
+            "shed_rate": shed / total if total else 0.0,
+            "p50_ms": percentile(all_latencies, 50) * 1000,
+            "p90_ms": percentile(all_latencies, 90) * 1000,
+            "p99_ms": percentile(all_latencies, 99) * 1000,
+            "operations": operations
+        }
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class LoadGenerator:
+    def __init__(self, api_url, mix, seed=0, timeout=60):
+        self.api_url = api_url.rstrip("/")
+        self.mix = mix
+        self.timeout = timeout
+        self.state = LoadState(seed)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=256)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def create_job(self, rng):
+        response = self.session.post(
+            f"{self.api_url}/jobs",
+            json={"title": "Load test role", "description": synthetic_job_description(rng)},
+            timeout=self.timeout
+        )
+        if response.status_code == 201:
+            self.state.add(self.state.job_ids, response.json()["job_id"])
+        return response.status_code
+
+    def apply(self, rng):
+        job_id = self.state.pick(self.state.job_ids)
+        index = next(self.state.counter)
+        response = self.session.post(
+            f"{self.api_url}/apply",
+            files={"resume": (f"loadtest_{index}.pdf", synthetic_resume(rng, index), "application/pdf")},
+            data={"job_id": job_id, "name": f"Candidate {index}", "email": f"candidate{index}@example.com"},
+            timeout=self.timeout
+        )
+        if response.status_code == 201:
+            self.state.add(self.state.application_ids, response.json()["application_id"])
+        return response.status_code
+
+    def list_candidates(self, rng):
+        job_id = self.state.pick(self.state.job_ids)
+        response = self.session.get(
+            f"{self.api_url}/jobs/{job_id}/candidates",
+            params={"page": 1, "per_page": 20},
+            timeout=self.timeout
+        )
+        return response.status_code
+
+    def schedule(self, rng):
+        application_id = self.state.pick(self.state.application_ids)
+        response = self.session.post(
+            f"{self.api_url}/schedule",
+            json={"application_id": application_id},
+            timeout=self.timeout
+        )
+        return response.status_code
+
+    def resolve(self, operation):
+        """operation, or the one creating what it acts on while none exists yet"""
+        if operation == "schedule" and not self.state.application_ids:
+            operation = "apply"
+        if operation in ("apply", "list_candidates") and not self.state.job_ids:
+            operation = "create_job"
+        return operation
+
+    def seed(self, jobs, applications):
+        """Create the jobs and applications later reads and schedules refer to"""
+        rng = random.Random(1)
+        for _ in range(jobs):
+            self.create_job(rng)
+        for _ in range(applications):
+            getattr(self, self.resolve("apply"))(rng)
+
+    def worker(self, result, deadline, seed):
+        rng = random.Random(seed)
+        operations = list(self.mix)
+        weights = [self.mix[name] for name in operations]
+        while time.monotonic() < deadline:
+            # Timed and recorded as the operation actually sent
+            operation = self.resolve(rng.choices(operations, weights)[0])
+            start = time.monotonic()
+            try:
+                status = getattr(self, operation)(rng)
+            except requests.RequestException:
+                status = None
+            result.record(operation, time.monotonic() - start, status)
+
+    def run_step(self, concurrency, duration):
+        result = StepResult(concurrency)
+        start = time.monotonic()
+        deadline = start + duration
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(self.worker, result, deadline, concurrency * 1000 + worker_id)
+                for worker_id in range(concurrency)
+            ]
+        # Re-raise anything that stopped a worker early
+        for future in futures:
+            future.result()
+        result.elapsed = time.monotonic() - start
+        return result.summary()
+
+
+def find_saturation(steps, min_gain=0.1, max_error_rate=0.05):
+    """Concurrency after which throughput stops growing or errors take over"""
+    saturation = steps[0]["concurrency"] if steps else None
+    for previous, current in zip(steps, steps[1:]):
+        gain = (current["throughput_rps"] - previous["throughput_rps"]) / max(previous["throughput_rps"], 1e-9)
+        if gain < min_gain or current["error_rate"] > max_error_rate:
+            return previous["concurrency"]
+        saturation = current["concurrency"]
+    return saturation
+
+
+def print_report(steps, saturation):
+    print(f"{'conc':>5} {'reqs':>7} {'rps':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>9} {'errors':>7} {'shed':>6}")
+    for step in steps:
+        print(
+            f"{step['concurrency']:>5} {step['requests']:>7} {step['throughput_rps']:>8.1f} "
+            f"{step['p50_ms']:>8.1f} {step['p90_ms']:>8.1f} {step['p99_ms']:>9.1f} "
+            f"{step['error_rate']:>7.1%} {step['shed_rate']:>6.1%}"
+        )
+    print(f"Saturation point: {saturation} concurrent clients")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api-url", default="http://localhost:5000/api")
+    parser.add_argument("--steps", default="1,2,4,8,16,32", help="comma separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per step")
+    parser.add_argument("--mix", default=None, help='JSON operation weights, e.g. \'{"apply": 0.5, "list_candidates": 0.5}\'')
+    parser.add_argument("--seed-jobs", type=int, default=5)
+    parser.add_argument("--seed-applications", type=int, default=20)
+    parser.add_argument("--stop-at-saturation", action="store_true", help="stop once throughput stops growing")
+    parser.add_argument("--output", help="write the step results as JSON to this file")
+    args = parser.parse_args()
+
+    mix = json.loads(args.mix) if args.mix else DEFAULT_MIX
+    generator = LoadGenerator(args.api_url, mix)
+    generator.seed(args.seed_jobs, args.seed_applications)
+
+    steps = []
+    for concurrency in [int(level) for level in args.steps.split(",")]:
+        steps.append(generator.run_step(concurrency, args.duration))
+        print_report(steps[-1:], find_saturation(steps))
+        if args.stop_at_saturation and len(steps) > 1 and find_saturation(steps) != steps[-1]["concurrency"]:
+            break
+
+    saturation = find_saturation(steps)
+    print()
+    print_report(steps, saturation)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"steps": steps, "saturation_concurrency": saturation}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Migrate candidates.parsed_data into hot columns and a compressed payload.
+
+Usage:
+    python migrate_parsed_data.py [path/to/recruitment.db]
+
+Prints database size and the memory needed to load every candidate row
+before and after the migration. Safe to re-run: rows that are already
+migrated are left alone.
+"""
+import json
+import os
+import sqlite3
+import sys
+import tracemalloc
+
+from parsed_storage import split_parsed_data
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'recruitment.db')
+
+NEW_COLUMNS = [
+    ("skills", "TEXT"),
+    ("education", "TEXT"),
+    ("word_count", "INTEGER DEFAULT 0"),
+    ("section_count", "INTEGER DEFAULT 0"),
+    ("parsed_blob", "BLOB")
+]
+
+# Columns the ORM loads for a plain Candidate query after the migration
+HOT_QUERY = (
+    "SELECT candidate_id, name, email, resume_path, skills, education, "
+    "word_count, section_count, created_at FROM candidates"
+)
+
+
+def get_columns(conn):
+    return {row[1] for row in conn.execute("PRAGMA table_info(candidates)")}
+
+
+def measure_query(conn, sql):
+    """Peak Python memory (bytes) needed to fetch every row of a query"""
+    tracemalloc.start()
+    rows = conn.execute(sql).fetchall()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return peak
+
+
+def migrate(conn):
+    """Populate the new columns from parsed_data and drop the old column"""
+    columns = get_columns(conn)
+    for name, ddl in NEW_COLUMNS:
+        if name not in columns:
+            conn.execute(f"ALTER TABLE candidates ADD COLUMN {name} {ddl}")
+
+    migrated = 0
+    if "parsed_data" in columns:
+        rows = conn.execute("SELECT candidate_id, parsed_data FROM candidates").fetchall()
+        for candidate_id, parsed_data in rows:
+            try:
+                hot, cold = split_parsed_data(parsed_data)
+            except ValueError:
+                hot, cold = split_parsed_data(None)
+            conn.execute(
+                "UPDATE candidates SET skills = ?, education = ?, word_count = ?, "
+                "section_count = ?, parsed_blob = ? WHERE candidate_id = ?",
+                (
+                    json.dumps(hot["skills"]),
+                    json.dumps(hot["education"]),
+                    hot["word_count"],
+                    hot["section_count"],
+                    cold,
+                    candidate_id
+                )
+            )
+            migrated += 1
+        conn.execute("ALTER TABLE candidates DROP COLUMN parsed_data")
+
+    conn.commit()
+    return migrated
+
+
+def main(db_path):
+    if not os.path.exists(db_path):
+        print(f"Database not found: {db_path}")
+        return 1
+
+    conn = sqlite3.connect(db_path)
+    size_before = os.path.getsize(db_path)
+    memory_before = measure_query(conn, "SELECT * FROM candidates")
+
+    migrated = migrate(conn)
+    conn.execute("VACUUM")
+
+    size_after = os.path.getsize(db_path)
+    memory_after = measure_query(conn, HOT_QUERY)
+    conn.close()
+
+    print(f"Migrated {migrated} candidate rows in {db_path}")
+    print(f"{'':<24}{'before':>12}{'after':>12}")
+    print(f"{'DB size (bytes)':<24}{size_before:>12}{size_after:>12}")
+    print(f"{'Query memory (bytes)':<24}{memory_before:>12}{memory_after:>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DB_PATH))
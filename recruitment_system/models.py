@@ -1,5 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, text
 from datetime import datetime
+import json
+from parsed_storage import split_parsed_data, decompress_payload
 
 db = SQLAlchemy()
 
@@ -9,6 +12,8 @@ class Job(db.Model):
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
     summary = db.Column(db.Text)  # JSON string
+    # Bumped whenever an application, score or status for this job changes
+    version = db.Column(db.Integer, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     applications = db.relationship('Application', backref='job', lazy=True)
 
@@ -18,16 +23,58 @@ class Candidate(db.Model):
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(100), nullable=False)
     resume_path = db.Column(db.String(200))
-    parsed_data = db.Column(db.Text)  # JSON string
+    skills = db.Column(db.Text)  # JSON list
+    education = db.Column(db.Text)  # JSON list
+    word_count = db.Column(db.Integer, default=0)
+    section_count = db.Column(db.Integer, default=0)
+    # zlib-compressed JSON of processed_text and sections, only loaded on access
+    parsed_blob = db.deferred(db.Column(db.LargeBinary))
+    minhash = db.deferred(db.Column(db.LargeBinary))  # MinHash signature of processed_text
+    duplicate_of = db.Column(db.Integer, db.ForeignKey('candidates.candidate_id'), index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     applications = db.relationship('Application', backref='candidate', lazy=True)
 
+    @property
+    def parsed_summary(self):
+        """Hot parsed fields, readable without loading the compressed payload"""
+        return {
+            "skills": json.loads(self.skills or '[]'),
+            "education": json.loads(self.education or '[]'),
+            "word_count": self.word_count or 0,
+            "section_count": self.section_count or 0
+        }
+
+    @property
+    def parsed_data(self):
+        """Full parser output as a JSON string (loads the deferred payload)"""
+        parsed = self.parsed_summary
+        parsed.update(decompress_payload(self.parsed_blob))
+        return json.dumps(parsed)
+
+    @parsed_data.setter
+    def parsed_data(self, value):
+        hot, cold = split_parsed_data(value)
+        self.skills = json.dumps(hot["skills"])
+        self.education = json.dumps(hot["education"])
+        self.word_count = hot["word_count"]
+        self.section_count = hot["section_count"]
+        self.parsed_blob = cold
+
+class LshBucket(db.Model):
+    """LSH band bucket of an original (non-duplicate) candidate's MinHash signature"""
+    __tablename__ = 'candidate_lsh'
+    band = db.Column(db.Integer, primary_key=True)
+    bucket = db.Column(db.BigInteger, primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.candidate_id'), primary_key=True)
+
 class Application(db.Model):
     __tablename__ = 'applications'
     application_id = db.Column(db.Integer, primary_key=True)
-    job_id = db.Column(db.Integer, db.ForeignKey('jobs.job_id'), nullable=False)
-    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.candidate_id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.job_id'), nullable=False, index=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.candidate_id'), nullable=False, index=True)
     match_score = db.Column(db.Float)
+    # rescoring.summary_key of the JD summary match_score was computed against
+    scored_summary = db.Column(db.String(40))
     status = db.Column(db.String(20), default='applied')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     interviews = db.relationship('Interview', backref='application', lazy=True)
@@ -38,4 +85,35 @@ class Interview(db.Model):
     application_id = db.Column(db.Integer, db.ForeignKey('applications.application_id'), nullable=False)
     interview_time = db.Column(db.DateTime)
     status = db.Column(db.String(20), default='scheduled')
-    created_at = db.Column(db.DateTime, default=datetime.utcnow) 
\ No newline at end of file
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Keep jobs.version in step with the job's applications, for ETags and response caches
+def _bump_job_version(connection, job_id):
+    connection.execute(
+        text("UPDATE jobs SET version = version + 1 WHERE job_id = :job_id"),
+        {"job_id": job_id}
+    )
+
+@event.listens_for(Application, "after_insert")
+def _after_application_insert(mapper, connection, target):
+    _bump_job_version(connection, target.job_id)
+
+@event.listens_for(Application, "after_update")
+def _after_application_update(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in ("match_score", "status", "job_id")):
+        _bump_job_version(connection, target.job_id)
+        previous_job_ids = state.attrs.job_id.history.deleted
+        for job_id in previous_job_ids:
+            _bump_job_version(connection, job_id)
+
+@event.listens_for(Application, "after_delete")
+def _after_application_delete(mapper, connection, target):
+    _bump_job_version(connection, target.job_id)
+
+@event.listens_for(Job, "before_update")
+def _before_job_update(mapper, connection, target):
+    # Match details are derived from the summary; bump in SQL since the
+    # loaded version may be behind the application events above
+    if inspect(target).attrs.summary.history.has_changes():
+        target.version = Job.version + 1
@@ -0,0 +1,31 @@
+"""Entry points run in the async server's parser process pool.
+
+Kept free of the web app and model imports so spawned workers start quickly.
+"""
+import json
+from agents.jd_summarizer import JDSummarizer
+from agents.resume_parser import ResumeParserAgent
+from agents.deduplicator import Deduplicator
+
+_resume_parser = None
+_jd_summarizer = None
+_deduplicator = None
+
+
+def init_worker():
+    """Build the agents once per worker process"""
+    global _resume_parser, _jd_summarizer, _deduplicator
+    _resume_parser = ResumeParserAgent()
+    _jd_summarizer = JDSummarizer()
+    _deduplicator = Deduplicator()
+
+
+def parse_resume(resume_path):
+    """Parse a resume and MinHash it, returning (parsed_data JSON, signature bytes)"""
+    parsed_data = _resume_parser.parse(resume_path)
+    signature = _deduplicator.signature(json.loads(parsed_data).get("processed_text", ""))
+    return parsed_data, _deduplicator.to_bytes(signature)
+
+
+def summarize_jd(description):
+    return _jd_summarizer.summarize(description)
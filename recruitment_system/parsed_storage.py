@@ -0,0 +1,44 @@
+import json
+import zlib
+
+# Fields that are small and read on every candidate listing
+HOT_FIELDS = ('skills', 'education')
+
+# Fields that are large and only needed for scoring and full-text work
+COLD_FIELDS = ('processed_text', 'sections')
+
+COMPRESSION_LEVEL = 6
+
+
+def split_parsed_data(parsed_data):
+    """Split parser output into hot fields, summary stats and a compressed cold payload"""
+    if isinstance(parsed_data, (str, bytes)):
+        parsed_data = json.loads(parsed_data) if parsed_data else {}
+    parsed_data = parsed_data or {}
+
+    processed_text = parsed_data.get('processed_text', '') or ''
+    sections = parsed_data.get('sections', {}) or {}
+
+    hot = {
+        "skills": list(parsed_data.get('skills', []) or []),
+        "education": list(parsed_data.get('education', []) or []),
+        "word_count": len(processed_text.split()),
+        "section_count": len(sections)
+    }
+    cold = compress_payload({
+        "processed_text": processed_text,
+        "sections": sections
+    })
+    return hot, cold
+
+
+def compress_payload(payload):
+    """Serialize a dict to zlib-compressed JSON"""
+    return zlib.compress(json.dumps(payload).encode('utf-8'), COMPRESSION_LEVEL)
+
+
+def decompress_payload(blob):
+    """Inverse of compress_payload; an empty blob decodes to empty cold fields"""
+    if not blob:
+        return {"processed_text": "", "sections": {}}
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
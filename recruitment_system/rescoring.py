@@ -0,0 +1,182 @@
+"""Background re-scoring of a job's applications after its JD summary changes."""
+import hashlib
+import json
+import logging
+import queue
+import threading
+from contextlib import nullcontext
+from sqlalchemy import case, or_
+from sqlalchemy.orm import Session, joinedload, undefer
+from models import Job, Candidate, Application
+from admission import Overloaded
+
+logger = logging.getLogger(__name__)
+
+# Applications still awaiting a decision are re-scored before the rest
+UNDECIDED_STATUSES = ("applied", "interview_scheduled")
+
+# Summary fields built from sets, whose order is not stable between runs
+UNORDERED_FIELDS = ("skills", "qualifications")
+
+
+def _normalized(summary):
+    summary = json.loads(summary) if summary else {}
+    for field in UNORDERED_FIELDS:
+        summary[field] = sorted(summary.get(field, []))
+    return summary
+
+
+def summary_changed(old_summary, new_summary):
+    """Whether two JD summaries would score resumes differently"""
+    return _normalized(old_summary) != _normalized(new_summary)
+
+
+def summary_key(summary):
+    """Digest of a JD summary, equal for summaries that score resumes the same"""
+    return hashlib.sha1(json.dumps(_normalized(summary), sort_keys=True).encode()).hexdigest()
+
+
+def rescoring_order(session, job_id, scored_summary=None):
+    """A job's application ids, undecided first, then best current match first
+
+    With scored_summary, only applications not already scored against that
+    summary are listed.
+    """
+    undecided_first = case((Application.status.in_(UNDECIDED_STATUSES), 0), else_=1)
+    query = session.query(Application.application_id).filter(Application.job_id == job_id)
+    if scored_summary is not None:
+        query = query.filter(or_(
+            Application.scored_summary.is_(None), Application.scored_summary != scored_summary
+        ))
+    rows = query.order_by(
+        undecided_first, Application.match_score.desc(), Application.application_id
+    )
+    return [application_id for application_id, in rows]
+
+
+class Rescorer:
+    """Single background worker re-scoring jobs whose summary changed
+
+    Applications are scored in priority order, batch_size per transaction,
+    from the resume parses stored on each candidate, so only the model pass
+    is repeated. Near-duplicate candidates share their original's score.
+    Only applications not yet scored against the current summary are
+    listed, so ones /api/apply scores against it during the pass cost no
+    second model pass. A job updated again mid-run restarts with the newest
+    summary instead of finishing the stale pass, and close() stops a pass
+    between batches.
+
+    admit, if given, returns a context manager held around each model pass,
+    so re-scoring shares the app's inference pool with /api/apply. When the
+    pool is saturated the pass waits and retries rather than being shed.
+    """
+
+    def __init__(self, engine, matcher, batch_size=50, admit=None):
+        self.engine = engine
+        self.matcher = matcher
+        self.batch_size = batch_size
+        self.admit = admit or nullcontext
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.generations = {}
+        self.progress = {}
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rescorer", daemon=True)
+        self._thread.start()
+
+    def submit(self, job_id):
+        """Queue a re-score of job_id, superseding any pass already queued or running"""
+        with self.lock:
+            generation = self.generations.get(job_id, 0) + 1
+            self.generations[job_id] = generation
+            self.progress[job_id] = {"state": "queued", "total": None, "rescored": 0}
+        self.queue.put((job_id, generation))
+
+    def status(self, job_id):
+        with self.lock:
+            progress = self.progress.get(job_id)
+            return dict(progress) if progress else None
+
+    def close(self):
+        self._stopping.set()
+        self.queue.put(None)
+        self._thread.join()
+
+    def _current(self, job_id, generation):
+        if self._stopping.is_set():
+            return False
+        with self.lock:
+            return self.generations.get(job_id) == generation
+
+    def _update(self, job_id, generation, **progress):
+        with self.lock:
+            if self.generations.get(job_id) == generation:
+                self.progress[job_id].update(progress)
+
+    def _compute_match(self, summary, parsed_data):
+        """One model pass, waiting for admission; None once close() is called"""
+        while not self._stopping.is_set():
+            try:
+                with self.admit():
+                    return self.matcher.compute_match(summary, parsed_data)
+            except Overloaded as e:
+                self._stopping.wait(e.retry_after)
+        return None
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            job_id, generation = item
+            if not self._current(job_id, generation):
+                continue
+            try:
+                self._rescore(job_id, generation)
+            except Exception as e:
+                logger.error(f"Error re-scoring job {job_id}: {str(e)}")
+                self._update(job_id, generation, state="failed")
+
+    def _rescore(self, job_id, generation):
+        with Session(self.engine) as session:
+            summary = session.query(Job.summary).filter(Job.job_id == job_id).scalar()
+        scored_summary = summary_key(summary)
+
+        scores = {}
+        rescored = 0
+        while True:
+            # Relisted after each pass for applications written meanwhile with a
+            # score from the old summary
+            with Session(self.engine) as session:
+                application_ids = rescoring_order(session, job_id, scored_summary)
+            self._update(job_id, generation, state="running", total=rescored + len(application_ids))
+            if not application_ids:
+                break
+
+            for start in range(0, len(application_ids), self.batch_size):
+                batch = application_ids[start:start + self.batch_size]
+                with Session(self.engine) as session:
+                    applications = session.query(Application).options(
+                        joinedload(Application.candidate).options(undefer(Candidate.parsed_blob))
+                    ).filter(Application.application_id.in_(batch)).all()
+                    applications.sort(key=lambda application: batch.index(application.application_id))
+
+                    for application in applications:
+                        candidate = application.candidate
+                        original_id = candidate.duplicate_of or candidate.candidate_id
+                        if original_id not in scores:
+                            scores[original_id] = self._compute_match(summary, candidate.parsed_data)
+                        application.match_score = scores[original_id]
+                        application.scored_summary = scored_summary
+
+                    # Scores for a summary that has since changed again are
+                    # dropped, as are those of a pass stopped by close()
+                    if not self._current(job_id, generation):
+                        return
+                    session.commit()
+
+                rescored += len(batch)
+                self._update(job_id, generation, rescored=rescored)
+
+        self._update(job_id, generation, state="done")
+        logger.info(f"Re-scored {rescored} applications for job {job_id}")
@@ -0,0 +1,62 @@
+import logging
+from sqlalchemy import inspect, text
+from migrate_parsed_data import migrate
+
+logger = logging.getLogger(__name__)
+
+# Columns added to existing tables after they were first created.
+# db.create_all() only creates missing tables, so these are added in place.
+ADDED_COLUMNS = [
+    ("candidates", "minhash", "BLOB"),
+    ("candidates", "duplicate_of", "INTEGER REFERENCES candidates (candidate_id)"),
+    ("jobs", "version", "INTEGER NOT NULL DEFAULT 0"),
+    ("applications", "scored_summary", "VARCHAR(40)")
+]
+
+# Indexes declared with index=True on columns of tables that predate them.
+# Named the way db.create_all() names them, so new databases are not indexed twice.
+ADDED_INDEXES = [
+    ("ix_applications_job_id", "applications", "job_id"),
+    ("ix_applications_candidate_id", "applications", "candidate_id"),
+    ("ix_candidates_duplicate_of", "candidates", "duplicate_of")
+]
+
+
+def migrate_parsed_data(engine):
+    """Split a pre-existing candidates.parsed_data column into the current columns"""
+    if "parsed_data" not in {c["name"] for c in inspect(engine).get_columns("candidates")}:
+        return
+    if engine.dialect.name != "sqlite":
+        raise RuntimeError(
+            "candidates.parsed_data must be migrated before startup; "
+            "see migrate_parsed_data.py"
+        )
+
+    connection = engine.raw_connection()
+    try:
+        migrated = migrate(connection.driver_connection)
+    finally:
+        connection.close()
+    logger.info(f"Migrated parsed_data of {migrated} candidates")
+
+
+def upgrade_schema(engine):
+    """Bring an older database up to the current models
+
+    Migrates the old parsed_data column, then adds any columns in
+    ADDED_COLUMNS and indexes in ADDED_INDEXES that are missing.
+    """
+    migrate_parsed_data(engine)
+    inspector = inspect(engine)
+    existing = {}
+    with engine.begin() as connection:
+        for table, column, ddl in ADDED_COLUMNS:
+            if table not in existing:
+                existing[table] = {c["name"] for c in inspector.get_columns(table)}
+            if column not in existing[table]:
+                connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+                logger.info(f"Added column {table}.{column}")
+        for index, table, column in ADDED_INDEXES:
+            if index not in {i["name"] for i in inspector.get_indexes(table)}:
+                connection.execute(text(f"CREATE INDEX {index} ON {table} ({column})"))
+                logger.info(f"Added index {index}")
@@ -0,0 +1,180 @@
+"""Request logic shared by the WSGI (app.py) and ASGI (asgi_app.py) servers.
+
+Functions here take a plain SQLAlchemy session so the async server can run
+them through AsyncSession.run_sync.
+"""
+from sqlalchemy.orm import joinedload
+from models import Job, Candidate, Application
+from dedupe import register_candidate, reusable_score
+from rescoring import summary_changed, summary_key
+
+
+class StaleSummary(Exception):
+    """The job's JD summary changed after an application's score was computed"""
+
+    def __init__(self, job_id):
+        super().__init__(f"Summary of job {job_id} changed while scoring")
+        self.job_id = job_id
+
+
+def add_application(session, deduplicator, job_id, name, email, resume_path, parsed_data,
+                    signature, duplicate_of, match_score, jd_summary=None):
+    """Add a candidate, its LSH buckets and its application for one job
+
+    Everything is written in the caller's transaction, so an application
+    costs one commit. duplicate_of and match_score are worked out
+    beforehand (see find_duplicate and known_match_score), keeping the
+    resume and model passes outside the write transaction.
+
+    jd_summary is the summary match_score was computed against. If the job
+    has been edited since, StaleSummary is raised before anything is
+    written, so the caller can score again: an application committed after
+    the edit is not covered by the edit's background re-score. The job row
+    is locked for the check where the backend supports it, so a concurrent
+    edit either commits first or waits until this application is visible
+    to its re-score.
+    """
+    if jd_summary is not None:
+        current_summary = session.query(Job.summary).filter(
+            Job.job_id == job_id
+        ).with_for_update().scalar()
+        if summary_changed(jd_summary, current_summary):
+            raise StaleSummary(job_id)
+
+    candidate = Candidate(
+        name=name,
+        email=email,
+        resume_path=resume_path,
+        parsed_data=parsed_data,
+        minhash=deduplicator.to_bytes(signature),
+        duplicate_of=duplicate_of
+    )
+    session.add(candidate)
+    session.flush()
+    if duplicate_of is None:
+        register_candidate(session, deduplicator, candidate.candidate_id, signature)
+
+    application = Application(
+        job_id=job_id,
+        candidate_id=candidate.candidate_id,
+        match_score=match_score,
+        scored_summary=summary_key(jd_summary) if jd_summary is not None else None
+    )
+    session.add(application)
+    session.flush()
+    return application
+
+
+def known_match_score(session, duplicate_of, job_id, jd_summary=None):
+    """Match score a near-duplicate's original already has for this job, if any
+
+    With jd_summary, only a score computed against that summary is reused,
+    so a score the background re-score has not reached yet is not copied.
+    """
+    if duplicate_of is None:
+        return None
+    scored_summary = summary_key(jd_summary) if jd_summary is not None else None
+    return reusable_score(session, duplicate_of, job_id, scored_summary)
+
+
+def apply_job_update(job, title=None, description=None, summary=None):
+    """Edit a job's fields, returning True if its applications need re-scoring
+
+    summary is the new description's JD summary. It replaces the stored one
+    only when it would score resumes differently.
+    """
+    if title is not None:
+        job.title = title
+    if description is not None:
+        job.description = description
+    if summary is None or not summary_changed(job.summary, summary):
+        return False
+    job.summary = summary
+    return True
+
+
+def candidate_page_rows(session, job_id, args):
+    """The job and the page of applications candidate_page renders, as (job, applications, headers)
+
+    Applications come with their candidates loaded, so candidate_entries
+    can run after the session is closed. job is None if it does not exist.
+    """
+    job = session.get(Job, job_id)
+    if not job:
+        return None, [], {}
+
+    query = session.query(Application).filter_by(job_id=job_id)
+    min_score = args.get("min_score", type=float)
+    if min_score is not None:
+        query = query.filter(Application.match_score >= min_score)
+    status = args.get("status")
+    if status:
+        query = query.filter(Application.status == status)
+    query = query.order_by(Application.match_score.desc(), Application.application_id)
+
+    headers = {}
+    page = args.get("page", type=int)
+    if page is not None:
+        page = max(page, 1)
+        per_page = min(max(args.get("per_page", 20, type=int), 1), 100)
+        headers["X-Total-Count"] = str(query.count())
+        query = query.offset((page - 1) * per_page).limit(per_page)
+
+    return job, query.options(joinedload(Application.candidate)).all(), headers
+
+
+def candidate_entries(matcher, job, applications, include_details):
+    """Response entries for applications loaded by candidate_page_rows"""
+    candidates = []
+
+    for application in applications:
+        candidate = application.candidate
+        entry = {
+            "application_id": application.application_id,
+            "candidate_id": candidate.candidate_id,
+            "name": candidate.name,
+            "email": candidate.email,
+            "match_score": application.match_score,
+            "status": application.status
+        }
+        if include_details:
+            # Hot fields and the stored score are enough here, so the
+            # compressed resume payload is never loaded
+            entry["match_details"] = matcher.get_match_details(
+                job.summary,
+                candidate.parsed_summary,
+                match_score=application.match_score
+            )
+        candidates.append(entry)
+
+    return candidates
+
+
+def candidate_page(session, matcher, job_id, args):
+    """Candidates for a job, best match first, as (entries, headers)
+
+    args is the request's query string: page and per_page paginate (the
+    total is returned in X-Total-Count), min_score and status filter, and
+    details=0 leaves out match_details.
+    """
+    job, applications, headers = candidate_page_rows(session, job_id, args)
+    if not job:
+        return [], {}
+    return candidate_entries(matcher, job, applications, args.get("details", "1") != "0"), headers
+
+
+def application_match_inputs(session, application_id):
+    """(jd_summary, parsed_summary, match_score) of one application, or None if it does not exist"""
+    application = session.get(Application, application_id)
+    if not application:
+        return None
+    return application.job.summary, application.candidate.parsed_summary, application.match_score
+
+
+def application_match_details(session, matcher, application_id):
+    """Match details for one application, or None if it does not exist"""
+    inputs = application_match_inputs(session, application_id)
+    if inputs is None:
+        return None
+    jd_summary, parsed_summary, match_score = inputs
+    return matcher.get_match_details(jd_summary, parsed_summary, match_score=match_score)
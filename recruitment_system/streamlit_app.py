@@ -1,7 +1,9 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import os
+import threading
 from datetime import datetime
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
@@ -17,6 +19,8 @@ st.set_page_config(
 
 # API Configuration
 API_URL = "http://localhost:5000/api"
+CANDIDATES_TTL = 60  # seconds a cached candidate page stays fresh
+MATCH_DETAILS_TTL = 300
 
 # Google OAuth Configuration
 SCOPES = ['https://www.googleapis.com/auth/gmail.send']
@@ -82,6 +86,60 @@ def get_match_score_color(score):
         return "medium-match"
     return "low-match"
 
+@st.cache_resource
+def get_http_session():
+    """One pooled HTTP session shared by every rerun and browser tab"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class JobVersions:
+    """Per-job counters used as a cache key component, bumped when a job's candidates change"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.versions = {}
+
+    def get(self, job_id):
+        with self.lock:
+            return self.versions.get(job_id, 0)
+
+    def bump(self, job_id):
+        with self.lock:
+            self.versions[job_id] = self.versions.get(job_id, 0) + 1
+
+@st.cache_resource
+def get_job_versions():
+    """Shared by every browser session, like the st.cache_data entries they key"""
+    return JobVersions()
+
+def get_job_version(job_id):
+    return get_job_versions().get(job_id)
+
+def invalidate_job(job_id):
+    """Drop cached candidate pages and match details for one job, in every session"""
+    get_job_versions().bump(job_id)
+
+@st.cache_data(ttl=CANDIDATES_TTL, show_spinner=False)
+def fetch_candidates(job_id, version, page, per_page, min_score, status):
+    """One page of a job's candidates without match details, plus the total count"""
+    params = {"page": page, "per_page": per_page, "details": 0}
+    if min_score > 0:
+        params["min_score"] = min_score
+    if status:
+        params["status"] = status
+    response = get_http_session().get(f"{API_URL}/jobs/{job_id}/candidates", params=params, timeout=30)
+    response.raise_for_status()
+    return response.json(), int(response.headers.get("X-Total-Count", 0))
+
+@st.cache_data(ttl=MATCH_DETAILS_TTL, show_spinner=False)
+def fetch_match_details(application_id, version):
+    response = get_http_session().get(f"{API_URL}/applications/{application_id}/match", timeout=30)
+    response.raise_for_status()
+    return response.json()
+
 # Create Job Page
 if page == "Create Job":
     st.title("Create New Job Posting")
@@ -93,7 +151,7 @@ if page == "Create Job":
         
         if submit:
             if title and description:
-                response = requests.post(
+                response = get_http_session().post(
                     f"{API_URL}/jobs",
                     json={"title": title, "description": description}
                 )
@@ -125,7 +183,7 @@ elif page == "Apply for Job":
                     "email": email
                 }
                 
-                response = requests.post(
+                response = get_http_session().post(
                     f"{API_URL}/apply",
                     files=files,
                     data=data
@@ -133,6 +191,7 @@ elif page == "Apply for Job":
                 
                 if response.status_code == 201:
                     result = response.json()
+                    invalidate_job(int(job_id))
                     st.success("Application submitted successfully!")
                     st.markdown(f"""
                         <div class="match-score {get_match_score_color(result['match_score'])}">
@@ -148,45 +207,68 @@ elif page == "Apply for Job":
 elif page == "View Candidates":
     st.title("View Candidates")
     
-    job_id = st.number_input("Job ID", min_value=1)
-    if st.button("Fetch Candidates"):
-        response = requests.get(f"{API_URL}/jobs/{job_id}/candidates")
-        
-        if response.status_code == 200:
-            candidates = response.json()
+    job_id = int(st.number_input("Job ID", min_value=1))
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        min_score = st.slider("Minimum Match Score", 0.0, 1.0, 0.0, 0.05)
+    with col2:
+        status = st.selectbox("Status", ["", "applied", "interview_scheduled"], format_func=lambda s: s or "Any")
+    with col3:
+        per_page = st.selectbox("Per Page", [10, 20, 50, 100], index=1)
+    with col4:
+        if st.button("Refresh"):
+            invalidate_job(job_id)
+
+    page_number = int(st.number_input("Page", min_value=1, key="candidates_page"))
+    version = get_job_version(job_id)
+    try:
+        candidates, total = fetch_candidates(job_id, version, page_number, per_page, min_score, status)
+    except requests.RequestException:
+        st.error("Failed to fetch candidates. Please try again.")
+        candidates, total = [], 0
+
+    page_count = max((total + per_page - 1) // per_page, 1)
+    st.caption(f"{total} candidates, page {page_number} of {page_count}")
+    
+    for candidate in candidates:
+        with st.expander(f"{candidate['name']} - Match Score: {candidate['match_score']:.2%}"):
+            col1, col2 = st.columns(2)
             
-            for candidate in candidates:
-                with st.expander(f"{candidate['name']} - Match Score: {candidate['match_score']:.2%}"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.write("**Contact Information**")
-                        st.write(f"Email: {candidate['email']}")
-                        st.write(f"Status: {candidate['status']}")
-                    
-                    with col2:
-                        st.write("**Match Details**")
-                        match_details = candidate['match_details']
-                        
-                        st.write("**Matching Skills:**")
-                        for skill in match_details['matching_skills']:
-                            st.write(f"✅ {skill}")
-                        
-                        st.write("**Missing Skills:**")
-                        for skill in match_details['missing_skills']:
-                            st.write(f"❌ {skill}")
-                        
-                        if match_details['matching_education']:
-                            st.write("**Matching Education:**")
-                            for edu in match_details['matching_education']:
-                                st.write(f"✅ {edu}")
-                        
-                        if match_details['missing_education']:
-                            st.write("**Missing Education:**")
-                            for edu in match_details['missing_education']:
-                                st.write(f"❌ {edu}")
-        else:
-            st.error("Failed to fetch candidates. Please try again.")
+            with col1:
+                st.write("**Contact Information**")
+                st.write(f"Email: {candidate['email']}")
+                st.write(f"Status: {candidate['status']}")
+                st.write(f"Application ID: {candidate['application_id']}")
+            
+            with col2:
+                st.write("**Match Details**")
+                # Expanders render eagerly, so details are only requested on demand
+                if not st.checkbox("Show match details", key=f"details_{candidate['application_id']}"):
+                    continue
+
+                try:
+                    match_details = fetch_match_details(candidate['application_id'], version)
+                except requests.RequestException:
+                    st.error("Failed to load match details.")
+                    continue
+                
+                st.write("**Matching Skills:**")
+                for skill in match_details['matching_skills']:
+                    st.write(f"✅ {skill}")
+                
+                st.write("**Missing Skills:**")
+                for skill in match_details['missing_skills']:
+                    st.write(f"❌ {skill}")
+                
+                if match_details['matching_education']:
+                    st.write("**Matching Education:**")
+                    for edu in match_details['matching_education']:
+                        st.write(f"✅ {edu}")
+                
+                if match_details['missing_education']:
+                    st.write("**Missing Education:**")
+                    for edu in match_details['missing_education']:
+                        st.write(f"❌ {edu}")
 
 # Schedule Interview Page
 elif page == "Schedule Interview":
@@ -204,13 +286,14 @@ elif page == "Schedule Interview":
     else:
         application_id = st.number_input("Application ID", min_value=1)
         if st.button("Schedule Interview"):
-            response = requests.post(
+            response = get_http_session().post(
                 f"{API_URL}/schedule",
                 json={"application_id": application_id}
             )
             
             if response.status_code == 201:
                 result = response.json()
+                invalidate_job(result['job_id'])
                 interview_time = datetime.fromisoformat(result['interview_time'])
                 st.success(f"""
                     Interview scheduled successfully!
@@ -0,0 +1,79 @@
+"""Synthetic resumes and job descriptions for load tests, benchmarks and distillation"""
+
+SKILLS = [
+    'python', 'java', 'javascript', 'sql', 'aws', 'docker', 'kubernetes',
+    'react', 'tensorflow', 'pytorch', 'pandas', 'numpy', 'kafka', 'spark'
+]
+
+DEGREES = [
+    'bachelor of technology in computer science',
+    'master of science in data science',
+    'bachelor of engineering in electronics',
+    'mba in technology management'
+]
+
+ROLES = ['software engineer', 'data scientist', 'backend developer', 'ml engineer', 'data engineer']
+
+
+def _escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def build_pdf(lines):
+    """Minimal single-page PDF with one line of Helvetica text per entry"""
+    content = ["BT", "/F1 11 Tf", "14 TL", "50 760 Td"]
+    for line in lines:
+        content.append(f"({_escape(line)}) Tj T*")
+    content.append("ET")
+    stream = "\n".join(content).encode("latin-1", "replace")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(pdf)
+
+
+def synthetic_resume(rng, index):
+    """A resume PDF with randomized skills, education and experience"""
+    name = f"Candidate {index}"
+    skills = rng.sample(SKILLS, rng.randint(3, 8))
+    years = rng.randint(1, 12)
+    lines = [
+        name,
+        f"{rng.choice(ROLES)} with {years} years of experience",
+        "",
+        "Education",
+        rng.choice(DEGREES),
+        "",
+        "Experience"
+    ]
+    for job in range(rng.randint(1, 4)):
+        lines.append(f"{rng.choice(ROLES)} at company {rng.randint(1, 500)}")
+        lines.append(f"built services using {', '.join(rng.sample(skills, min(3, len(skills))))}")
+    lines += ["", "Skills", ", ".join(skills)]
+    return build_pdf(lines)
+
+
+def synthetic_job_description(rng):
+    skills = rng.sample(SKILLS, rng.randint(3, 6))
+    return (
+        f"We are hiring a {rng.choice(ROLES)} with {rng.randint(1, 8)}+ years of experience. "
+        f"Required skills: {', '.join(skills)}. "
+        f"A {rng.choice(['bachelor', 'master'])} degree in computer science or similar is expected."
+    )